@@ -1,4 +1,13 @@
 #!/bin/sh
 
 python manage.py migrate --noinput
-gunicorn mozillians.wsgi:application -w 2 -b 0.0.0.0:${PORT:-8000} --log-file -
+# gthread workers heartbeat from the main thread, so long streaming
+# responses (e.g. admin exports) are not killed by the worker timeout.
+# Each worker serves GUNICORN_THREADS requests at once, so requests
+# blocked on the DB or the cache do not stall the others.
+gunicorn mozillians.wsgi:application \
+    -w ${WEB_CONCURRENCY:-2} \
+    -k ${GUNICORN_WORKER_CLASS:-gthread} \
+    --threads ${GUNICORN_THREADS:-4} \
+    -b 0.0.0.0:${PORT:-8000} \
+    --log-file -
@@ -6,3 +6,6 @@ default_app_config = "mozillians.announcements.AnnouncementsConfig"
 
 class AnnouncementsConfig(AppConfig):
     name = "mozillians.announcements"
+
+    def ready(self):
+        import mozillians.announcements.signals  # noqa
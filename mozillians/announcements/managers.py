@@ -1,7 +1,12 @@
+from django.core.cache import cache
 from django.db import models
-from django.db.models import Q
+from django.db.models import Min, Q
 from django.utils.timezone import now
 
+LATEST_ANNOUNCEMENT_KEY = "latest_announcement"
+# Upper bound in seconds, saves and deletes invalidate it anyway.
+LATEST_ANNOUNCEMENT_TIMEOUT = 60 * 60 * 24
+
 
 class AnnouncementManager(models.Manager):
     """Announcements Manager."""
@@ -23,3 +28,36 @@ class AnnouncementManager(models.Manager):
             Q(publish_from__gt=_now)
             | (Q(publish_until__isnull=False) & Q(publish_until__lte=_now))
         )
+
+    def latest_published(self):
+        """Return the latest published announcement or None.
+
+        It is cached until the next time an announcement is published or
+        the latest one expires, whichever comes first.
+        """
+        _now = now()
+        entry = cache.get(LATEST_ANNOUNCEMENT_KEY)
+        if entry is not None and (entry["until"] is None or _now < entry["until"]):
+            return entry["announcement"]
+
+        announcement = self.published().order_by("-publish_from").first()
+        # The next announcement to be published becomes the latest.
+        until = self.filter(publish_from__gt=_now).aggregate(until=Min("publish_from"))[
+            "until"
+        ]
+        if announcement and announcement.publish_until:
+            if until is None or announcement.publish_until < until:
+                until = announcement.publish_until
+
+        timeout = LATEST_ANNOUNCEMENT_TIMEOUT
+        if until is not None:
+            timeout = min(timeout, int((until - _now).total_seconds()) + 1)
+        cache.set(
+            LATEST_ANNOUNCEMENT_KEY,
+            {"announcement": announcement, "until": until},
+            timeout,
+        )
+        return announcement
+
+    def invalidate_latest_published(self):
+        cache.delete(LATEST_ANNOUNCEMENT_KEY)
@@ -3,12 +3,12 @@ import uuid
 
 from jinja2 import Markup
 
-import bleach
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.timezone import now
 from mozillians.announcements.managers import AnnouncementManager
+from mozillians.common.sanitize import clean_html
 from sorl.thumbnail import ImageField
 
 ALLOWED_TAGS = ["em", "strong", "a", "u"]
@@ -41,7 +41,7 @@ class Announcement(models.Model):
     )
 
     def clean(self):
-        self.text = bleach.clean(self.text, tags=ALLOWED_TAGS, strip=True)
+        self.text = clean_html(self.text, ALLOWED_TAGS)
         if self.publish_until and self.publish_until < self.publish_from:
             raise ValidationError("Publish until must come after publish from.")
 
@@ -62,3 +62,9 @@ class Announcement(models.Model):
     class Meta:
         ordering = ["-publish_from"]
         get_latest_by = "publish_from"
+        indexes = [
+            models.Index(
+                fields=["publish_from", "publish_until"],
+                name="announcement_publish_idx",
+            )
+        ]
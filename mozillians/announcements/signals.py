@@ -0,0 +1,29 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import signals
+from django.dispatch import receiver
+
+from mozillians.announcements.models import Announcement
+from mozillians.common.thumbnails import generate_thumbnails, get_geometries
+
+
+# Signal to invalidate the cached latest announcement
+@receiver(signals.post_save, sender=Announcement, dispatch_uid="announcement_cache_sig")
+@receiver(
+    signals.post_delete, sender=Announcement, dispatch_uid="announcement_cache_sig"
+)
+def invalidate_latest_announcement_sig(sender, instance, **kwargs):
+    # Only once committed, so that it is not cached again from the
+    # announcements being replaced.
+    transaction.on_commit(Announcement.objects.invalidate_latest_published)
+
+
+# Signal to generate the thumbnails of uploaded images
+@receiver(
+    signals.post_save, sender=Announcement, dispatch_uid="announcement_thumbnail_sig"
+)
+def pregenerate_thumbnails_sig(sender, instance, **kwargs):
+    # Rendered in this process, only admins upload images.
+    for image, geometries in get_geometries(instance):
+        transaction.on_commit(partial(generate_thumbnails, image.name, geometries))
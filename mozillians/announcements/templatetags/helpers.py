@@ -6,7 +6,4 @@ from mozillians.announcements.models import Announcement
 @library.global_function
 def latest_announcement():
     """Return the latest published announcement or None."""
-
-    if Announcement.objects.published().count():
-        return Announcement.objects.published().latest()
-    return None
+    return Announcement.objects.latest_published()
@@ -4,8 +4,11 @@ from datetime import datetime
 from mock import patch
 from nose.tools import eq_
 
+from django.core.cache import cache
+from django.test.utils import override_settings
 from django.utils.timezone import make_aware
 
+from mozillians.announcements.managers import LATEST_ANNOUNCEMENT_KEY
 from mozillians.announcements.models import Announcement
 from mozillians.announcements.tests import AnnouncementFactory, TestCase
 
@@ -60,3 +63,72 @@ class AnnouncementManagerTests(TestCase):
 
         mock_obj.return_value = make_aware(datetime(2013, 2, 24), pytz.UTC)
         eq_(Announcement.objects.unpublished().count(), 3)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class LatestPublishedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.first = AnnouncementFactory.create(
+            publish_from=make_aware(datetime(2013, 2, 12), pytz.UTC),
+            publish_until=make_aware(datetime(2013, 2, 18), pytz.UTC),
+        )
+        self.second = AnnouncementFactory.create(
+            publish_from=make_aware(datetime(2013, 2, 15), pytz.UTC),
+            publish_until=make_aware(datetime(2013, 2, 17), pytz.UTC),
+        )
+
+    @patch("mozillians.announcements.managers.now")
+    def test_cached(self, mock_obj):
+        mock_obj.return_value = make_aware(datetime(2013, 2, 13), pytz.UTC)
+        eq_(Announcement.objects.latest_published(), self.first)
+        with self.assertNumQueries(0):
+            eq_(Announcement.objects.latest_published(), self.first)
+        eq_(
+            cache.get(LATEST_ANNOUNCEMENT_KEY)["until"],
+            make_aware(datetime(2013, 2, 15), pytz.UTC),
+        )
+
+    @patch("mozillians.announcements.managers.now")
+    def test_publish_window(self, mock_obj):
+        mock_obj.return_value = make_aware(datetime(2013, 2, 10), pytz.UTC)
+        eq_(Announcement.objects.latest_published(), None)
+
+        mock_obj.return_value = make_aware(datetime(2013, 2, 12), pytz.UTC)
+        eq_(Announcement.objects.latest_published(), self.first)
+
+        mock_obj.return_value = make_aware(datetime(2013, 2, 15), pytz.UTC)
+        eq_(Announcement.objects.latest_published(), self.second)
+
+        mock_obj.return_value = make_aware(datetime(2013, 2, 17), pytz.UTC)
+        eq_(Announcement.objects.latest_published(), self.first)
+
+        mock_obj.return_value = make_aware(datetime(2013, 2, 18), pytz.UTC)
+        eq_(Announcement.objects.latest_published(), None)
+        eq_(cache.get(LATEST_ANNOUNCEMENT_KEY)["until"], None)
+
+    @patch("mozillians.announcements.signals.transaction.on_commit", lambda func: func())
+    @patch("mozillians.announcements.managers.now")
+    def test_invalidated(self, mock_obj):
+        mock_obj.return_value = make_aware(datetime(2013, 2, 13), pytz.UTC)
+        eq_(Announcement.objects.latest_published(), self.first)
+
+        third = AnnouncementFactory.create(
+            publish_from=make_aware(datetime(2013, 2, 12, 12), pytz.UTC)
+        )
+        eq_(Announcement.objects.latest_published(), third)
+
+        third.delete()
+        eq_(Announcement.objects.latest_published(), self.first)
+
+    @patch("mozillians.announcements.managers.now")
+    def test_invalidated_after_commit(self, mock_obj):
+        mock_obj.return_value = make_aware(datetime(2013, 2, 13), pytz.UTC)
+        eq_(Announcement.objects.latest_published(), self.first)
+        # The test transaction never commits.
+        AnnouncementFactory.create(
+            publish_from=make_aware(datetime(2013, 2, 12, 12), pytz.UTC)
+        )
+        eq_(Announcement.objects.latest_published(), self.first)
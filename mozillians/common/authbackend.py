@@ -1,33 +1,191 @@
+import logging
+import time
+from hashlib import sha1
+
+import requests
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousOperation
+from django.utils.encoding import smart_text
+from josepy.jws import JWS, Header
 from mozilla_django_oidc.auth import OIDCAuthenticationBackend
 
-from mozillians.users.models import IdpProfile
+from mozillians.users.models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+JWKS_CACHE_KEY = "oidc_jwks"
+JWKS_LOCK_KEY = "oidc_jwks_lock"
+# Seconds a worker holds the JWKS fetch lock, and others wait for its result.
+JWKS_LOCK_TIMEOUT = 5
+JWKS_HITS_KEY = "oidc_jwks_hits"
+JWKS_MISSES_KEY = "oidc_jwks_misses"
+# Seconds the JWKS hit and miss counters live before they start over.
+JWKS_STATS_TIMEOUT = 7 * 24 * 3600
+
+
+def identity_cache_key(auth0_user_id):
+    """Cache key for the identity resolved for an Auth0 user id."""
+    digest = sha1((auth0_user_id or "").encode("utf-8")).hexdigest()
+    return "oidc_identity:{0}".format(digest)
+
+
+def _find_jwk(jwks, header):
+    """Return the key of jwks matching the kid and alg of a JWS header."""
+    for jwk in jwks["keys"]:
+        if jwk["kid"] != smart_text(header.kid):
+            continue
+        if "alg" in jwk and jwk["alg"] != smart_text(header.alg):
+            continue
+        return jwk
+    return None
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # First count, or the counter expired. If another worker created
+        # it in between, count on it.
+        if not cache.add(key, 1, JWKS_STATS_TIMEOUT):
+            cache.incr(key)
+
+
+def jwks_cache_stats():
+    """Return the JWKS cache hits, misses and hit rate across all workers."""
+    hits = cache.get(JWKS_HITS_KEY, 0)
+    misses = cache.get(JWKS_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": float(hits) / total if total else 0.0,
+    }
 
 
 class MozilliansAuthBackend(OIDCAuthenticationBackend):
     """Override OIDCAuthenticationBackend to provide custom functionality."""
 
-    def filter_users_by_claims(self, claims):
-        """Override default method to store claims."""
-        users = super(MozilliansAuthBackend, self).filter_users_by_claims(claims)
+    def get_user(self, user_id):
+        """Return the user for the session, with the profile loaded in the same query."""
+        try:
+            return self.UserModel.objects.select_related("userprofile").get(pk=user_id)
+        except self.UserModel.DoesNotExist:
+            return None
+
+    def _fetch_jwks(self):
+        response = requests.get(
+            self.OIDC_OP_JWKS_ENDPOINT,
+            verify=self.get_settings("OIDC_VERIFY_SSL", True),
+            timeout=self.get_settings("OIDC_TIMEOUT", None),
+            proxies=self.get_settings("OIDC_PROXY", None),
+        )
+        response.raise_for_status()
+        jwks = {"keys": response.json()["keys"], "fetched": time.time()}
+        cache.set(JWKS_CACHE_KEY, jwks, settings.OIDC_JWKS_CACHE_TIMEOUT)
+        return jwks
+
+    def _refresh_jwks(self, stale=None):
+        """Fetch the JWKS from the OP once across all workers.
+
+        The worker that takes the lock fetches the document, the rest wait
+        for it to show up in the cache instead of hitting the OP too.
+        """
+        if cache.add(JWKS_LOCK_KEY, True, JWKS_LOCK_TIMEOUT):
+            try:
+                return self._fetch_jwks()
+            finally:
+                cache.delete(JWKS_LOCK_KEY)
+
+        deadline = time.time() + JWKS_LOCK_TIMEOUT
+        while time.time() < deadline:
+            time.sleep(0.05)
+            jwks = cache.get(JWKS_CACHE_KEY)
+            if jwks and (not stale or jwks["fetched"] > stale["fetched"]):
+                return jwks
+        return self._fetch_jwks()
+
+    def retrieve_matching_jwk(self, token):
+        """Get the signing key from the cached JWKS of the OP."""
+        header = Header.json_loads(JWS.from_compact(token).signature.protected)
+
+        jwks = cache.get(JWKS_CACHE_KEY)
+        key = _find_jwk(jwks, header) if jwks else None
+        if key is not None:
+            _incr(JWKS_HITS_KEY)
+            return key
+
+        _incr(JWKS_MISSES_KEY)
+        # An unknown kid means the OP may have rotated its keys. Refresh, but
+        # not more often than OIDC_JWKS_MIN_REFRESH, so that forged tokens
+        # cannot be used to flood the OP.
+        min_refresh = settings.OIDC_JWKS_MIN_REFRESH
+        if not jwks or time.time() - jwks["fetched"] >= min_refresh:
+            jwks = self._refresh_jwks(jwks)
+            key = _find_jwk(jwks, header)
+        if key is None:
+            raise SuspiciousOperation("Could not find a valid JWKS.")
+        return key
+
+    def verify_token(self, token, **kwargs):
+        """Time token verification, including any JWKS retrieval."""
+        start = time.time()
+        try:
+            return super(MozilliansAuthBackend, self).verify_token(token, **kwargs)
+        finally:
+            logger.info(
+                "OIDC token verification took %.1fms",
+                (time.time() - start) * 1000,
+            )
+
+    def _resolve_users(self, claims, auth0_user_id):
+        email = claims.get("email")
+        users = self.UserModel.objects.select_related("userprofile")
+
+        # Try the cached resolution for this (user id, email) pair first.
+        cached = cache.get(identity_cache_key(auth0_user_id))
+        if cached and cached["email"] == email:
+            resolved = users.filter(pk=cached["user_id"])
+            if resolved:
+                return resolved
+
+        if email:
+            resolved = users.filter(email__iexact=email)
+            if resolved:
+                return resolved
 
         # Checking the primary email returned 0 users,
         # before creating a new user we should check if the identity returned exists
-        if not users:
-            # Ensure compatibility with OIDC conformant mode
-            auth0_user_id = claims.get("user_id") or claims.get("sub")
-            idps = IdpProfile.objects.filter(auth0_user_id=auth0_user_id)
-            user_ids = idps.values_list("profile__user__id", flat=True).distinct()
-            users = self.UserModel.objects.filter(id__in=user_ids).distinct()
-
-        if (
-            users.count() != 1
-            or not users[0].userprofile
-            or not users[0].userprofile.is_vouched
-        ):
+        if auth0_user_id:
+            resolved = users.filter(
+                userprofile__idp_profiles__auth0_user_id=auth0_user_id
+            ).distinct()
+            if resolved:
+                return resolved
+        return users.none()
+
+    def filter_users_by_claims(self, claims):
+        """Override default method to store claims."""
+        # Ensure compatibility with OIDC conformant mode
+        auth0_user_id = claims.get("user_id") or claims.get("sub")
+        users = self._resolve_users(claims, auth0_user_id)
+
+        try:
+            is_vouched = len(users) == 1 and users[0].userprofile.is_vouched
+        except UserProfile.DoesNotExist:
+            is_vouched = False
+
+        if not is_vouched:
             msg = "Only vouched users are allowed to login to this mozillians.org archive."
             messages.error(self.request, msg)
             return get_user_model().objects.none()
 
+        if auth0_user_id:
+            cache.set(
+                identity_cache_key(auth0_user_id),
+                {"email": claims.get("email"), "user_id": users[0].pk},
+                settings.OIDC_IDENTITY_CACHE_TIMEOUT,
+            )
         return users
@@ -0,0 +1,20 @@
+import os
+
+from django.conf import settings
+from jinja2 import FileSystemBytecodeCache as _FileSystemBytecodeCache
+
+
+class FileSystemBytecodeCache(_FileSystemBytecodeCache):
+    """Jinja2 bytecode cache stored in JINJA2_BYTECODE_DIR.
+
+    Compiled templates survive restarts and deploys, each entry is checked
+    against the checksum of its source before use. django_jinja passes the
+    name of the cache, which is only used as the file name pattern.
+    """
+
+    def __init__(self, name):
+        directory = settings.JINJA2_BYTECODE_DIR
+        os.makedirs(directory, exist_ok=True)
+        super(FileSystemBytecodeCache, self).__init__(
+            directory, "__%s_%%s.cache" % name
+        )
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+from mozillians.common.compress import verify_sri_manifest
+
+
+@register("compressor")
+def check_sri_manifest(app_configs, **kwargs):
+    """Check that the deployed compressed files match the SRI manifest."""
+    if not (settings.COMPRESS_ENABLED and settings.COMPRESS_OFFLINE):
+        return []
+    return [
+        Error(
+            "Compressed file %s is missing or does not match its SRI value." % path,
+            hint="Run manage.py compress to compress the files again.",
+            id="common.E001",
+        )
+        for path in verify_sri_manifest()
+    ]
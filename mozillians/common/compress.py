@@ -1,30 +1,112 @@
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.utils.safestring import mark_safe
 
 import base64
+import json
+import os
 
 from compressor.css import CssCompressor
 from compressor.js import JsCompressor
+from compressor.storage import default_storage
+from functools import lru_cache
 from hashlib import sha384
 
+# Stored next to the offline manifest of compressor, maps the path of each
+# output file to its SRI value.
+SRI_MANIFEST = "sri.json"
+SRI_CACHE_SIZE = 64
 
+_sri_manifest = None
+# Whether the compress command is recording the SRI values of its output.
+_recording = False
+
+
+@lru_cache(maxsize=SRI_CACHE_SIZE)
 def _compute_sri_value(content):
     sri_hash = sha384(content.encode("utf-8")).digest()
-    sri_value = base64.b64encode(sri_hash)
+    sri_value = base64.b64encode(sri_hash).decode("ascii")
     return "sha384-{}".format(sri_value)
 
 
+def get_sri_manifest_filename():
+    output_dir = settings.COMPRESS_OUTPUT_DIR.strip("/")
+    return os.path.join(output_dir, SRI_MANIFEST)
+
+
+def get_sri_manifest():
+    """Return the SRI values of the output files, read once per process."""
+    global _sri_manifest
+    if _sri_manifest is None:
+        filename = get_sri_manifest_filename()
+        if default_storage.exists(filename):
+            with default_storage.open(filename) as fp:
+                _sri_manifest = json.loads(fp.read().decode("utf8"))
+        else:
+            _sri_manifest = {}
+    return _sri_manifest
+
+
+def reset_sri_manifest(manifest=None):
+    global _sri_manifest, _recording
+    _sri_manifest = manifest
+    _recording = False
+
+
+def record_sri_manifest():
+    """Start an empty manifest listing the files output from now on."""
+    global _sri_manifest, _recording
+    _sri_manifest = {}
+    _recording = True
+
+
+def write_sri_manifest(manifest):
+    filename = get_sri_manifest_filename()
+    content = json.dumps(manifest, indent=2, sort_keys=True).encode("utf8")
+    if default_storage.exists(filename):
+        default_storage.delete(filename)
+    default_storage.save(filename, ContentFile(content))
+    reset_sri_manifest()
+
+
+def verify_sri_manifest():
+    """Return the output files missing or differing from their SRI value."""
+    invalid = []
+    for path, sri in sorted(get_sri_manifest().items()):
+        if not default_storage.exists(path):
+            invalid.append(path)
+            continue
+        with default_storage.open(path) as fp:
+            content = fp.read().decode("utf-8")
+        if _compute_sri_value(content) != sri:
+            invalid.append(path)
+    return invalid
+
+
 class SRIMixin(object):
     def output_file(self, mode, content, forced=False, basename=None):
         """
         The output method that saves the content to a file and renders
         the appropriate template with the file's URL.
+
+        With offline compression, files listed in the SRI manifest were
+        saved by the compress command, their SRI value is taken from it.
+        Online, the manifest is neither read nor extended.
         """
         new_filepath = self.get_filepath(content, basename=basename)
-        if not self.storage.exists(new_filepath) or forced:
-            self.storage.save(new_filepath, ContentFile(content.encode(self.charset)))
+        sri = None
+        if settings.COMPRESS_OFFLINE and not forced:
+            sri = get_sri_manifest().get(new_filepath)
+        if sri is None:
+            if not self.storage.exists(new_filepath) or forced:
+                self.storage.save(
+                    new_filepath, ContentFile(content.encode(self.charset))
+                )
+            sri = _compute_sri_value(content)
+            if _recording:
+                get_sri_manifest()[new_filepath] = sri
         url = mark_safe(self.storage.url(new_filepath))
-        context = {"url": url, "sri": _compute_sri_value(content)}
+        context = {"url": url, "sri": sri}
         return self.render_output(mode, context)
 
     def output_inline(self, mode, content, forced=False, basename=None):
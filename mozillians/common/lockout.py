@@ -0,0 +1,196 @@
+import logging
+
+from axes.conf import settings
+from axes.handlers.database import AxesDatabaseHandler
+from axes.helpers import (
+    get_cache,
+    get_cache_timeout,
+    get_client_cache_key,
+    get_client_str,
+    get_client_username,
+    get_credentials,
+    get_failure_limit,
+    get_query_str,
+)
+from axes.models import AccessAttempt
+from axes.signals import user_locked_out
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+# Failed clients waiting to be flushed to the DB are queued in the cache:
+# AUDIT_SEQ_KEY numbers the queue entries and AUDIT_FLUSHED_KEY remembers
+# the last entry that was flushed.
+AUDIT_SEQ_KEY = "axes_audit_seq"
+AUDIT_FLUSHED_KEY = "axes_audit_flushed"
+AUDIT_FLUSH_CHUNK_SIZE = 500
+
+
+def _audit_entry_key(seq):
+    return "axes_audit:{0}".format(seq)
+
+
+def _audit_client_key(cache_keys):
+    return "axes_audit_client:{0}".format(cache_keys[0])
+
+
+def _incr(cache, key, timeout):
+    """Atomically increment key, creating it with timeout if needed."""
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The key expired in between, start over.
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def _failures(cache, cache_keys):
+    return max(list(cache.get_many(cache_keys).values()) or [0])
+
+
+def _save_attempt(client, failures):
+    AccessAttempt.objects.update_or_create(
+        username=client["username"],
+        ip_address=client["ip_address"],
+        user_agent=client["user_agent"],
+        defaults={
+            "get_data": client["get_data"],
+            "post_data": client["post_data"],
+            "http_accept": client["http_accept"],
+            "path_info": client["path_info"],
+            "attempt_time": client["attempt_time"],
+            "failures_since_start": failures,
+        },
+    )
+
+
+class AxesCacheHandler(AxesDatabaseHandler):
+    """Count failed logins in the cache instead of the AccessAttempt table.
+
+    Lockout checks and failed attempts only touch the cache, the counters
+    expire AXES_COOLOFF_TIME after the first failure. The DB is written to
+    when a client crosses the failure limit, and by flush_attempts() which
+    stores the current counters of recently failing clients for auditing.
+    Successful logins and logouts are still recorded in the AccessLog.
+    """
+
+    def __init__(self):
+        self.cache = get_cache()
+        self.cache_timeout = get_cache_timeout()
+
+    def get_failures(self, request, credentials=None):
+        return _failures(self.cache, get_client_cache_key(request, credentials))
+
+    def user_login_failed(self, sender, credentials, request=None, **kwargs):
+        if request is None:
+            logger.error("AXES: user_login_failed does not function without a request.")
+            return
+
+        username = get_client_username(request, credentials)
+        client_str = get_client_str(
+            username,
+            request.axes_ip_address,
+            request.axes_user_agent,
+            request.axes_path_info,
+        )
+        if self.is_whitelisted(request, credentials):
+            logger.info("AXES: Login failed from whitelisted client %s.", client_str)
+            return
+
+        cache_keys = get_client_cache_key(request, credentials)
+        counts = [_incr(self.cache, key, self.cache_timeout) for key in cache_keys]
+        failures = max(counts)
+        limit = get_failure_limit(request, credentials)
+        logger.warning(
+            "AXES: Login failure by %s. Count = %d of %d.", client_str, failures, limit
+        )
+
+        client = {
+            "username": username,
+            "ip_address": request.axes_ip_address,
+            "user_agent": request.axes_user_agent,
+            "get_data": get_query_str(request.GET).replace("\0", "0x00"),
+            "post_data": get_query_str(request.POST).replace("\0", "0x00"),
+            "http_accept": request.axes_http_accept,
+            "path_info": request.axes_path_info,
+            "attempt_time": request.axes_attempt_time,
+            "cache_keys": cache_keys,
+        }
+        self._queue_for_audit(client)
+
+        if settings.AXES_LOCK_OUT_AT_FAILURE and failures >= limit:
+            request.axes_locked_out = True
+            if limit in counts:
+                # This attempt crossed the limit: lock out for a full cool
+                # off period from now on and record the lockout.
+                logger.warning(
+                    "AXES: Locking out %s after repeated login failures.", client_str
+                )
+                for key in cache_keys:
+                    self.cache.touch(key, self.cache_timeout)
+                _save_attempt(client, failures)
+
+            user_locked_out.send(
+                "axes",
+                request=request,
+                username=username,
+                ip_address=request.axes_ip_address,
+            )
+
+    def _queue_for_audit(self, client):
+        key = _audit_client_key(client["cache_keys"])
+        if self.cache.add(key, client, self.cache_timeout):
+            seq = _incr(self.cache, AUDIT_SEQ_KEY, None)
+            self.cache.set(_audit_entry_key(seq), key, self.cache_timeout)
+        else:
+            self.cache.set(key, client, self.cache_timeout)
+
+    def user_logged_in(self, sender, request, user, **kwargs):
+        super(AxesCacheHandler, self).user_logged_in(sender, request, user, **kwargs)
+        if settings.AXES_RESET_ON_SUCCESS:
+            credentials = get_credentials(user.get_username())
+            self.cache.delete_many(get_client_cache_key(request, credentials))
+
+    def reset_attempts(self, ip_address=None, username=None, ip_or_username=False):
+        attempts = AccessAttempt.objects.all()
+        if ip_or_username:
+            attempts = attempts.filter(Q(ip_address=ip_address) | Q(username=username))
+        else:
+            if ip_address:
+                attempts = attempts.filter(ip_address=ip_address)
+            if username:
+                attempts = attempts.filter(username=username)
+        for attempt in attempts:
+            self.cache.delete_many(get_client_cache_key(attempt))
+        return super(AxesCacheHandler, self).reset_attempts(
+            ip_address=ip_address, username=username, ip_or_username=ip_or_username
+        )
+
+    def flush_attempts(self):
+        """Store the failure counters of clients queued since the last flush.
+
+        Returns the number of AccessAttempt records written.
+        """
+        last = self.cache.get(AUDIT_FLUSHED_KEY, 0)
+        seq = self.cache.get(AUDIT_SEQ_KEY, 0)
+        if seq < last:
+            # The sequence was evicted and started over.
+            last = 0
+
+        count = 0
+        for start in range(last + 1, seq + 1, AUDIT_FLUSH_CHUNK_SIZE):
+            stop = min(start + AUDIT_FLUSH_CHUNK_SIZE, seq + 1)
+            entries = self.cache.get_many(
+                [_audit_entry_key(n) for n in range(start, stop)]
+            )
+            clients = self.cache.get_many(list(entries.values()))
+            # Later failures of these clients queue them again.
+            self.cache.delete_many(list(entries.values()) + list(entries.keys()))
+            for client in clients.values():
+                failures = _failures(self.cache, client["cache_keys"])
+                if failures:
+                    _save_attempt(client, failures)
+                    count += 1
+            self.cache.set(AUDIT_FLUSHED_KEY, stop - 1, None)
+        return count
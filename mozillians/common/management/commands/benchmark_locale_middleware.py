@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from mozillians.common.middleware import LocaleURLMiddleware
+
+PATHS = [
+    "/en-US/",
+    "/en-US/u/someone/",
+    "/u/someone/",
+    "/de/about/",
+    "/pt/about/",
+    "/oidc/callback/",
+    "/api/v2/users/",
+]
+
+
+class Command(BaseCommand):
+    help = "Measure LocaleURLMiddleware throughput in requests/sec."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20000,
+            help="Number of requests per path.",
+        )
+
+    def handle(self, *args, **options):
+        middleware = LocaleURLMiddleware(lambda request: HttpResponse())
+        factory = RequestFactory()
+        count = options["requests"]
+
+        total = 0.0
+        for path in PATHS:
+            requests = [factory.get(path) for i in range(count)]
+            start = time.time()
+            for request in requests:
+                middleware(request)
+            elapsed = time.time() - start
+            total += elapsed
+            self.stdout.write("%-22s %10.0f requests/sec" % (path, count / elapsed))
+        self.stdout.write(
+            "%-22s %10.0f requests/sec" % ("overall", count * len(PATHS) / total)
+        )
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import reverse as django_reverse
+from django.utils.encoding import iri_to_uri
+
+from mozillians.common import urlresolvers
+from mozillians.common.templatetags.helpers import url
+
+
+def unbuilt_url(viewname, *args):
+    """What url() did before URL builders."""
+    prefixer = urlresolvers.get_url_prefix()
+    return iri_to_uri(prefixer.fix(django_reverse(viewname, None, args, None, "/")))
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-call cost of url() for the profile links of a profile "
+        "with many vouchees."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vouchees", type=int, default=1000, help="Number of profile links."
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=10, help="Number of profiles rendered."
+        )
+
+    def handle(self, *args, **options):
+        urlresolvers.set_url_prefix(urlresolvers.Prefixer(RequestFactory().get("/")))
+        usernames = ["vouchee%d" % i for i in range(options["vouchees"])]
+        calls = len(usernames) * options["rounds"]
+
+        for label, func in (("django reverse", unbuilt_url), ("url builder", url)):
+            start = time.time()
+            for i in range(options["rounds"]):
+                for username in usernames:
+                    func("phonebook:profile_view", username)
+            elapsed = time.time() - start
+            self.stdout.write(
+                "%-15s %6.2fus/call %7.2fms/profile"
+                % (
+                    label,
+                    elapsed * 1e6 / calls,
+                    elapsed * 1000 / options["rounds"],
+                )
+            )
@@ -0,0 +1,21 @@
+from compressor.management.commands import compress
+
+from mozillians.common.compress import (
+    get_sri_manifest,
+    record_sri_manifest,
+    write_sri_manifest,
+)
+
+
+class Command(compress.Command):
+    help = (
+        "Compress content outside of the request/response cycle and write "
+        "the SRI manifest of the output files."
+    )
+
+    def handle_inner(self, **options):
+        # Only list the files of this run.
+        record_sri_manifest()
+        result = super(Command, self).handle_inner(**options)
+        write_sri_manifest(get_sri_manifest())
+        return result
@@ -0,0 +1,17 @@
+from axes.handlers.proxy import AxesProxyHandler
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Store the failed login counters kept in the cache as AccessAttempt "
+        "records. Run more often than AXES_COOLOFF_TIME."
+    )
+
+    def handle(self, *args, **options):
+        handler = AxesProxyHandler.get_implementation()
+        if not hasattr(handler, "flush_attempts"):
+            raise CommandError("AXES_HANDLER does not keep attempts in the cache.")
+
+        count = handler.flush_attempts()
+        self.stdout.write("%d login attempt records flushed." % count)
@@ -0,0 +1,59 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+
+def percentile(latencies, fraction):
+    return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent anonymous requests to a running instance and report "
+        "throughput and latency, e.g. to compare gunicorn worker settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="+", help="URLs requested in turn.")
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Concurrent clients."
+        )
+        parser.add_argument(
+            "--requests", type=int, default=500, help="Total number of requests."
+        )
+
+    def handle(self, *args, **options):
+        urls = options["urls"]
+        local = threading.local()
+
+        def fetch(i):
+            # One connection pool per client thread.
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+            start = time.time()
+            response = local.session.get(urls[i % len(urls)], allow_redirects=False)
+            return response.status_code, time.time() - start
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(fetch, range(options["requests"])))
+        elapsed = time.time() - start
+
+        latencies = sorted(latency * 1000 for status, latency in results)
+        errors = sum(1 for status, latency in results if status >= 500)
+        self.stdout.write(
+            "%d requests, %d concurrent: %.1f requests/sec, %d errors"
+            % (len(results), options["concurrency"], len(results) / elapsed, errors)
+        )
+        self.stdout.write(
+            "latency p50 %.1fms, p95 %.1fms, p99 %.1fms, max %.1fms"
+            % (
+                percentile(latencies, 0.5),
+                percentile(latencies, 0.95),
+                percentile(latencies, 0.99),
+                latencies[-1],
+            )
+        )
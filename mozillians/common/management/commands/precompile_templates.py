@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from jinja2 import TemplateSyntaxError
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile the Jinja2 templates of the project and the apps into the "
+        "bytecode cache, so that workers do not compile them on first use."
+    )
+
+    def handle(self, *args, **options):
+        env = engines["jinja2"].env
+        if env.bytecode_cache is None:
+            raise CommandError("The Jinja2 bytecode cache is disabled.")
+
+        count = 0
+        for name in env.list_templates():
+            try:
+                env.get_template(name)
+            except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+                self.stderr.write("Could not compile %s: %s" % (name, exc))
+            else:
+                count += 1
+        self.stdout.write("%d templates compiled." % count)
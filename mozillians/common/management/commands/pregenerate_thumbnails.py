@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from mozillians.common.thumbnails import pregenerate_thumbnails
+
+
+class Command(BaseCommand):
+    help = "Generate the thumbnails listed in THUMBNAIL_GEOMETRIES of stored images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.THUMBNAIL_WORKERS,
+            help="Number of processes generating thumbnails.",
+        )
+
+    def handle(self, *args, **options):
+        sources = []
+        for key, geometries in settings.THUMBNAIL_GEOMETRIES.items():
+            label, field = key.rsplit(".", 1)
+            model = apps.get_model(label)
+            names = (
+                model.objects.exclude(**{field: ""})
+                .values_list(field, flat=True)
+                .distinct()
+            )
+            sources += [(name, geometries) for name in names.iterator()]
+
+        # Forked workers open connections of their own.
+        connections.close_all()
+        count = 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = pregenerate_thumbnails(sources, executor=executor)
+            for future in as_completed(futures):
+                count += future.result()
+        self.stdout.write(
+            "%d thumbnails of %d images generated." % (count, len(sources))
+        )
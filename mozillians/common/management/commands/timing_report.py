@@ -0,0 +1,77 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from mozillians.common.authbackend import (
+    JWKS_HITS_KEY,
+    JWKS_MISSES_KEY,
+    jwks_cache_stats,
+)
+from mozillians.common.timing import (
+    HISTOGRAM_BUCKETS,
+    HISTOGRAM_KEY,
+    HISTOGRAM_VIEWS_KEY,
+    get_stage_names,
+)
+
+BUCKETS = [str(bucket) for bucket in HISTOGRAM_BUCKETS] + ["inf"]
+
+
+def percentile(counts, total, fraction):
+    seen = 0
+    for bucket, count in zip(BUCKETS, counts):
+        seen += count
+        if seen >= total * fraction:
+            return bucket
+    return BUCKETS[-1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the request timing histograms collected with TIMING_ENABLED "
+        "and the hit rate of the OIDC JWKS cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Clear the histograms afterwards."
+        )
+
+    def handle(self, *args, **options):
+        views = sorted(cache.get(HISTOGRAM_VIEWS_KEY, set()))
+        stages = get_stage_names() + ["template", "total"]
+        stages += ["view:" + view for view in views]
+
+        self.stdout.write(
+            "%-50s %8s %8s %8s  %s"
+            % ("stage", "requests", "p50 ms", "p95 ms", " ".join(BUCKETS))
+        )
+        keys = []
+        for stage in stages:
+            stage_keys = [HISTOGRAM_KEY.format(stage, bucket) for bucket in BUCKETS]
+            keys += stage_keys
+            values = cache.get_many(stage_keys)
+            counts = [values.get(key, 0) for key in stage_keys]
+            total = sum(counts)
+            if not total:
+                continue
+            self.stdout.write(
+                "%-50s %8d %8s %8s  %s"
+                % (
+                    stage,
+                    total,
+                    percentile(counts, total, 0.5),
+                    percentile(counts, total, 0.95),
+                    " ".join(str(count) for count in counts),
+                )
+            )
+
+        jwks = jwks_cache_stats()
+        self.stdout.write(
+            "\nJWKS cache: %d hits, %d misses (%.1f%% hit rate)"
+            % (jwks["hits"], jwks["misses"], jwks["hit_rate"] * 100)
+        )
+
+        if options["reset"]:
+            cache.delete_many(
+                keys + [HISTOGRAM_VIEWS_KEY, JWKS_HITS_KEY, JWKS_MISSES_KEY]
+            )
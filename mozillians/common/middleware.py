@@ -1,18 +1,45 @@
-import re
 import urllib.request, urllib.parse, urllib.error
+from collections import namedtuple
 from contextlib import contextmanager
 
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpResponsePermanentRedirect
 from django.utils.encoding import iri_to_uri
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import activate
 from django.utils.translation import ugettext_lazy as _lazy
 
 from mozillians.common import urlresolvers
+from mozillians.users.managers import PUBLIC
 
 LOGIN_MESSAGE = _lazy("You must be logged in to continue.")
 GET_VOUCHED_MESSAGE = _lazy("You must be vouched to continue.")
 
+# What the user behind a request is allowed to see, computed once per request.
+Viewer = namedtuple(
+    "Viewer", ["is_authenticated", "privacy_level", "is_vouched", "is_staff"]
+)
+ANONYMOUS_VIEWER = Viewer(
+    is_authenticated=False, privacy_level=PUBLIC, is_vouched=False, is_staff=False
+)
+
+
+def get_viewer(user):
+    """Return the Viewer for user."""
+    if not user.is_authenticated:
+        return ANONYMOUS_VIEWER
+    try:
+        profile = user.userprofile
+    except ObjectDoesNotExist:
+        return ANONYMOUS_VIEWER._replace(is_authenticated=True)
+    return Viewer(
+        is_authenticated=True,
+        privacy_level=profile.privacy_level,
+        is_vouched=profile.is_vouched,
+        is_staff=profile.is_staff,
+    )
+
 
 @contextmanager
 def safe_query_string(request):
@@ -42,18 +69,18 @@ class LocaleURLMiddleware(object):
 
     def __call__(self, request):
 
-        request.locale = settings.LANGUAGE_CODE
-        activate(settings.LANGUAGE_CODE)
-
-        for view_url in settings.EXEMPT_L10N_URLS:
-            if re.search(view_url, request.path):
-                return self.get_response(request)
+        if urlresolvers.get_exempt_l10n_re().search(request.path):
+            request.locale = settings.LANGUAGE_CODE
+            activate(settings.LANGUAGE_CODE)
+            return self.get_response(request)
 
         prefixer = urlresolvers.Prefixer(request)
         urlresolvers.set_url_prefix(prefixer)
         full_path = prefixer.fix(prefixer.shortened_path)
 
         if full_path != request.path:
+            request.locale = settings.LANGUAGE_CODE
+            activate(settings.LANGUAGE_CODE)
             query_string = request.META.get("QUERY_STRING", "")
             full_path = urllib.parse.quote(full_path.encode("utf-8"))
 
@@ -109,3 +136,18 @@ class ReferrerPolicyMiddleware(object):
             response[referrer_header_name] = "no-referrer"
 
         return response
+
+
+class ViewerMiddleware(object):
+    """Attach the immutable Viewer of request.user as request.viewer.
+
+    Must come after AuthenticationMiddleware. The viewer is computed
+    lazily, at most once per request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.viewer = SimpleLazyObject(lambda: get_viewer(request.user))
+        return self.get_response(request)
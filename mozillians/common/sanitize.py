@@ -0,0 +1,93 @@
+import threading
+from functools import lru_cache
+from hashlib import sha1
+
+import bleach
+import markdown as markdown_module
+from django.core.cache import cache
+
+MARKDOWN_TAGS = (
+    "p",
+    "em",
+    "li",
+    "ul",
+    "a",
+    "strong",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+)
+MARKDOWN_ATTRIBUTES = ("href",)
+MARKDOWN_KEY = "markdown:{0}"
+# Bump to drop the rendered HTML cached by a previous renderer.
+MARKDOWN_KEY_VERSION = 1
+MARKDOWN_CACHE_TIMEOUT = 60 * 60 * 24
+MARKDOWN_LRU_SIZE = 2048
+
+_local = threading.local()
+
+
+def get_cleaner(tags, attributes=None, styles=()):
+    """Return a bleach Cleaner stripping all but the given tags.
+
+    Cleaners are reused, one per thread since their parser keeps state.
+    The allow-lists are tuples so that they can be keys, attributes
+    defaults to the ones bleach allows.
+    """
+    cleaners = _local.__dict__.setdefault("cleaners", {})
+    key = (tags, attributes, styles)
+    if key not in cleaners:
+        cleaners[key] = bleach.Cleaner(
+            tags=list(tags),
+            attributes=(
+                bleach.ALLOWED_ATTRIBUTES if attributes is None else list(attributes)
+            ),
+            styles=list(styles),
+            strip=True,
+        )
+    return cleaners[key]
+
+
+def clean_html(text, tags, attributes=None, styles=()):
+    if attributes is not None:
+        attributes = tuple(attributes)
+    return get_cleaner(tuple(tags), attributes, tuple(styles)).clean(text)
+
+
+def _get_markdown():
+    # Like cleaners, Markdown instances keep state while converting.
+    md = getattr(_local, "markdown", None)
+    if md is None:
+        md = _local.markdown = markdown_module.Markdown()
+    return md
+
+
+@lru_cache(maxsize=MARKDOWN_LRU_SIZE)
+def _render_markdown(text, tags, attributes, styles):
+    digest = sha1(
+        repr((MARKDOWN_KEY_VERSION, text, tags, attributes, styles)).encode("utf-8")
+    ).hexdigest()
+    key = MARKDOWN_KEY.format(digest)
+    html = cache.get(key)
+    if html is None:
+        html = get_cleaner(tags, attributes, styles).clean(
+            _get_markdown().reset().convert(text)
+        )
+        cache.set(key, html, MARKDOWN_CACHE_TIMEOUT)
+    return html
+
+
+def render_markdown(
+    text, tags=MARKDOWN_TAGS, attributes=MARKDOWN_ATTRIBUTES, styles=()
+):
+    """Render markdown text to HTML sanitized down to the allowed tags.
+
+    Rendered texts are kept in a per-process LRU and in the shared cache,
+    keyed by a hash of the text and the allow-lists.
+    """
+    if not text:
+        return ""
+    return _render_markdown(text, tuple(tags), tuple(attributes), tuple(styles))
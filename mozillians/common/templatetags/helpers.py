@@ -4,8 +4,6 @@ import urllib.request
 from datetime import datetime, timedelta
 from hashlib import md5
 
-import bleach
-import markdown as markdown_module
 from django.conf import settings
 from django.contrib.staticfiles.storage import staticfiles_storage
 from django.http import HttpResponseRedirect
@@ -18,13 +16,20 @@ from django.utils.translation import ugettext as _
 from django_jinja import library
 from jinja2 import Markup, contextfunction
 from pytz import timezone, utc
-from sorl.thumbnail import get_thumbnail
 
 from mozillians.common import utils
+from mozillians.common.sanitize import (
+    MARKDOWN_ATTRIBUTES,
+    MARKDOWN_TAGS,
+    render_markdown,
+)
+from mozillians.common.thumbnails import get_thumbnail_or_placeholder
 from mozillians.common.urlresolvers import reverse
 from mozillians.users.managers import PUBLIC
 
 GRAVATAR_URL = "https://secure.gravatar.com/avatar/{emaildigest}"
+# Context passed on by render_list()
+LIST_CONTEXT_KEYS = ("request", "user", "csrf_token", "LANG", "DIR")
 
 
 @library.global_function
@@ -127,8 +132,8 @@ def mozillians_form(element):
 
 @library.global_function
 def thumbnail(img, geometry, **kwargs):
-    """Proxy to solr's get_thumbnail."""
-    return get_thumbnail(img, geometry, **kwargs)
+    """Return the pregenerated thumbnail of img or a placeholder."""
+    return get_thumbnail_or_placeholder(img, geometry, **kwargs)
 
 
 def redirect(to, *args, **kwargs):
@@ -139,30 +144,14 @@ def redirect(to, *args, **kwargs):
 
 @library.filter
 def markdown(text, allowed_tags=None, allowed_attributes=None, allowed_styles=None):
-    if not allowed_tags:
-        allowed_tags = [
-            "p",
-            "em",
-            "li",
-            "ul",
-            "a",
-            "strong",
-            "h1",
-            "h2",
-            "h3",
-            "h4",
-            "h5",
-            "h6",
-        ]
-    if not allowed_attributes:
-        allowed_attributes = ["href"]
-    if not allowed_styles:
-        allowed_styles = []
-    text = markdown_module.markdown(text, safe_mode="remove")
-    clean_text = bleach.clean(
-        text, allowed_tags, allowed_attributes, allowed_styles, strip=True
+    return Markup(
+        render_markdown(
+            text,
+            allowed_tags or MARKDOWN_TAGS,
+            allowed_attributes or MARKDOWN_ATTRIBUTES,
+            allowed_styles or (),
+        )
     )
-    return Markup(clean_text)
 
 
 @library.global_function
@@ -319,6 +308,10 @@ def nonprefixed_url(viewname, *args, **kwargs):
 @library.global_function
 def get_privacy_level(request):
     """Helper to get the privacy level of the request.user"""
+    viewer = getattr(request, "viewer", None)
+    if viewer is not None:
+        return viewer.privacy_level
+
     try:
         profile = request.user.userprofile
     except AttributeError:
@@ -330,6 +323,23 @@ def get_privacy_level(request):
     return privacy_level
 
 
+@library.global_function
+@contextfunction
+def render_list(context, template_name, items, **kwargs):
+    """Renders a list of items with a single template invocation.
+
+    The template loops over ``items`` itself. Rather than a copy of the
+    calling context, it gets the request, user, CSRF token and privacy
+    level of the viewer, plus kwargs.
+    """
+    request = context.get("request")
+    data = dict((key, context[key]) for key in LIST_CONTEXT_KEYS if key in context)
+    if request is not None:
+        data["privacy_level"] = get_privacy_level(request)
+    data.update(kwargs, items=items)
+    return mark_safe(get_template(template_name).render(data))
+
+
 @library.global_function
 def get_privacy_aware_photo_url(profile, privacy_level, geometry, **kwargs):
     """Returns privacy aware profile photo url."""
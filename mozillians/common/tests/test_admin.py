@@ -0,0 +1,57 @@
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from nose.tools import eq_
+
+from mozillians.common.tests import TestCase
+from mozillians.users.models import UserProfile
+from mozillians.users.tests import UserFactory
+
+
+class LogEntryAdminTests(TestCase):
+    def setUp(self):
+        self.admin = UserFactory.create(is_superuser=True, is_staff=True)
+        self.url = reverse("admin:admin_logentry_changelist")
+
+    def _create_entries(self, count):
+        content_type = ContentType.objects.get_for_model(UserProfile)
+        for i in range(count):
+            user = UserFactory.create(is_staff=True)
+            LogEntry.objects.log_action(
+                user.pk,
+                content_type.pk,
+                user.userprofile.pk,
+                str(user.userprofile.pk),
+                ADDITION,
+            )
+
+    def _count_queries(self):
+        client = Client()
+        client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.url)
+        eq_(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_query_count(self):
+        self._create_entries(2)
+        num_queries = self._count_queries()
+        self._create_entries(10)
+        eq_(self._count_queries(), num_queries)
+
+    def test_user_filter_only_lists_related_users(self):
+        UserFactory.create_batch(3)
+        self._create_entries(2)
+        client = Client()
+        client.force_login(self.admin)
+        response = client.get(self.url)
+        user_filter = [
+            spec
+            for spec in response.context["cl"].filter_specs
+            if spec.field_path == "user"
+        ][0]
+        eq_(len(user_filter.lookup_choices), 2)
@@ -1,7 +1,15 @@
+import json
+
+import josepy as jose
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousOperation
 from django.http import HttpRequest
 from django.test import override_settings
 
-from mock import Mock
+from mock import Mock, patch
 from nose.tools import eq_, ok_
 
 from mozillians.common.tests import TestCase
@@ -198,3 +206,157 @@ class MozilliansAuthBackendTests(TestCase):
         self.backend.request = request_mock
         returned_user = self.backend.check_authentication_method(user)
         ok_(not returned_user.userprofile.is_vouched)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class IdentityResolutionTests(TestCase):
+    """Test the cached identity resolution of Mozillian's Authentication Backend."""
+
+    def setUp(self):
+        from mozillians.common.authbackend import MozilliansAuthBackend
+
+        cache.clear()
+        self.backend = MozilliansAuthBackend()
+        self.backend.request = Mock(spec=HttpRequest)
+        self.user = UserFactory.create(email="foo@example.com")
+        IdpProfile.objects.create(
+            profile=self.user.userprofile,
+            auth0_user_id="github|12345",
+            email="foo@bar.com",
+            primary=True,
+        )
+        self.claims = {"email": "bar@example.com", "sub": "github|12345"}
+
+    def _resolve(self):
+        users = self.backend.filter_users_by_claims(self.claims)
+        ok_(users[0].userprofile.is_vouched)
+        return list(users)
+
+    def test_resolve_by_identity(self):
+        # email lookup, then identity lookup with the profile joined in
+        with self.assertNumQueries(2):
+            eq_(self._resolve(), [self.user])
+
+    def test_resolve_cached(self):
+        self._resolve()
+        with self.assertNumQueries(1):
+            eq_(self._resolve(), [self.user])
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    @patch("mozillians.common.authbackend.messages")
+    def test_cache_invalidated_on_identity_change(self, messages_mock):
+        self._resolve()
+        IdpProfile.objects.filter(auth0_user_id="github|12345").delete()
+        # The deleted identity no longer resolves
+        with self.assertNumQueries(2):
+            eq_(list(self.backend.filter_users_by_claims(self.claims)), [])
+        ok_(messages_mock.error.called)
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    @patch("mozillians.common.authbackend.messages")
+    def test_cache_invalidated_on_auth0_user_id_change(self, messages_mock):
+        self._resolve()
+        idp = IdpProfile.objects.get(auth0_user_id="github|12345")
+        idp.auth0_user_id = "github|67890"
+        idp.save()
+        # The previous user id no longer resolves
+        with self.assertNumQueries(2):
+            eq_(list(self.backend.filter_users_by_claims(self.claims)), [])
+        ok_(messages_mock.error.called)
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    def test_cache_invalidated_on_email_change(self):
+        self._resolve()
+        user = User.objects.get(pk=self.user.pk)
+        user.email = "baz@example.com"
+        user.save()
+        # Resolved again instead of from the cache
+        with self.assertNumQueries(2):
+            eq_(self._resolve(), [self.user])
+
+
+def _create_jwk(kid):
+    key = jose.JWKRSA(key=rsa.generate_private_key(65537, 2048, default_backend()))
+    public = key.public_key().to_json()
+    public.update(kid=kid, alg="RS256")
+    return key, public
+
+
+def _sign(key, kid, payload):
+    return jose.JWS.sign(
+        json.dumps(payload).encode("utf-8"),
+        key=key,
+        alg=jose.RS256,
+        protect=frozenset(["alg", "kid"]),
+        kid=kid,
+    ).to_compact()
+
+
+class StubOP(object):
+    """Minimal OP serving a JWKS document and counting the fetches."""
+
+    def __init__(self, *keys):
+        self.keys = list(keys)
+        self.fetches = 0
+
+    def get(self, url, **kwargs):
+        self.fetches += 1
+        response = Mock()
+        response.json.return_value = {"keys": self.keys}
+        return response
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    OIDC_RP_SIGN_ALGO="RS256",
+    OIDC_OP_JWKS_ENDPOINT="https://server.example.com/jwks",
+    OIDC_OP_TOKEN_ENDPOINT="https://server.example.com/token",
+    OIDC_OP_USER_ENDPOINT="https://server.example.com/user",
+    OIDC_RP_CLIENT_ID="example_id",
+    OIDC_RP_CLIENT_SECRET="client_secret",
+)
+class JWKSCacheTests(TestCase):
+    """Test the JWKS cache of Mozillian's Authentication Backend."""
+
+    def setUp(self):
+        from mozillians.common.authbackend import MozilliansAuthBackend
+
+        cache.clear()
+
+        self.key1, public1 = _create_jwk("key1")
+        self.key2, self.public2 = _create_jwk("key2")
+        self.op = StubOP(public1)
+        patcher = patch("mozillians.common.authbackend.requests.get", self.op.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = MozilliansAuthBackend()
+
+    def _verify(self, key, kid):
+        token = _sign(key, kid, {"nonce": "foo"})
+        return self.backend.verify_token(token, nonce="foo")
+
+    def test_jwks_cached(self):
+        from mozillians.common.authbackend import jwks_cache_stats
+
+        for i in range(3):
+            eq_(self._verify(self.key1, "key1"), {"nonce": "foo"})
+        eq_(self.op.fetches, 1)
+        stats = jwks_cache_stats()
+        eq_((stats["hits"], stats["misses"]), (2, 1))
+
+    @override_settings(OIDC_JWKS_MIN_REFRESH=0)
+    def test_unknown_kid_refreshes_jwks(self):
+        self._verify(self.key1, "key1")
+        self.op.keys.append(self.public2)
+        eq_(self._verify(self.key2, "key2"), {"nonce": "foo"})
+        eq_(self.op.fetches, 2)
+
+    @override_settings(OIDC_JWKS_MIN_REFRESH=60)
+    def test_unknown_kid_refresh_rate_limited(self):
+        self._verify(self.key1, "key1")
+        self.op.keys.append(self.public2)
+        with self.assertRaises(SuspiciousOperation):
+            self._verify(self.key2, "key2")
+        eq_(self.op.fetches, 1)
@@ -0,0 +1,38 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.test.utils import override_settings
+
+from mock import patch
+from nose.tools import eq_, ok_
+
+from mozillians.common.bytecode import FileSystemBytecodeCache
+from mozillians.common.tests import TestCase
+
+
+class PrecompileTemplatesTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.env = engines["jinja2"].env
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_precompile_templates(self):
+        with override_settings(JINJA2_BYTECODE_DIR=self.directory):
+            bytecode_cache = FileSystemBytecodeCache("jinja2")
+        with patch.object(self.env, "bytecode_cache", bytecode_cache):
+            with patch.object(self.env, "cache", {}):
+                call_command("precompile_templates", stdout=StringIO())
+        files = os.listdir(self.directory)
+        eq_(len(files), len(self.env.list_templates()))
+        ok_(all(name.startswith("__jinja2_") for name in files))
+
+    def test_bytecode_cache_disabled(self):
+        with patch.object(self.env, "bytecode_cache", None):
+            with self.assertRaises(CommandError):
+                call_command("precompile_templates")
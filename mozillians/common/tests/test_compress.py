@@ -0,0 +1,104 @@
+import base64
+from hashlib import sha384
+from io import BytesIO
+
+from django.test.utils import override_settings
+
+from mock import Mock, patch
+from nose.tools import eq_, ok_
+
+from mozillians.common import compress
+from mozillians.common.checks import check_sri_manifest
+from mozillians.common.tests import TestCase
+
+
+class FakeCompressor(object):
+    charset = "utf-8"
+
+    def __init__(self):
+        self.storage = Mock()
+        self.storage.url.side_effect = lambda path: "/static/" + path
+
+    def get_filepath(self, content, basename=None):
+        return "CACHE/js/output.js"
+
+    def render_output(self, mode, context):
+        return context
+
+
+class SRICompressor(compress.SRIMixin, FakeCompressor):
+    pass
+
+
+class SRITests(TestCase):
+    def setUp(self):
+        compress.reset_sri_manifest({})
+
+    def tearDown(self):
+        compress.reset_sri_manifest()
+
+    def test_compute_sri_value(self):
+        digest = base64.b64encode(sha384(b"var a;").digest()).decode("ascii")
+        eq_(compress._compute_sri_value("var a;"), "sha384-" + digest)
+
+    @override_settings(COMPRESS_OFFLINE=False)
+    def test_output_file(self):
+        compressor = SRICompressor()
+        compressor.storage.exists.return_value = False
+        context = compressor.output_file("file", "var a;")
+        eq_(context["url"], "/static/CACHE/js/output.js")
+        eq_(context["sri"], compress._compute_sri_value("var a;"))
+        ok_(compressor.storage.save.called)
+        eq_(compress.get_sri_manifest(), {})
+
+    def test_output_file_recorded(self):
+        compress.record_sri_manifest()
+        compressor = SRICompressor()
+        context = compressor.output_file("file", "var a;", forced=True)
+        ok_(compressor.storage.save.called)
+        eq_(compress.get_sri_manifest(), {"CACHE/js/output.js": context["sri"]})
+
+    @override_settings(COMPRESS_OFFLINE=True)
+    def test_output_file_in_manifest(self):
+        compress.reset_sri_manifest({"CACHE/js/output.js": "sha384-foo"})
+        compressor = SRICompressor()
+        context = compressor.output_file("file", "var a;")
+        eq_(context["sri"], "sha384-foo")
+        ok_(not compressor.storage.exists.called)
+        ok_(not compressor.storage.save.called)
+
+    @override_settings(COMPRESS_OFFLINE=False)
+    def test_output_file_online_ignores_manifest(self):
+        compress.reset_sri_manifest({"CACHE/js/output.js": "sha384-foo"})
+        compressor = SRICompressor()
+        compressor.storage.exists.return_value = False
+        context = compressor.output_file("file", "var a;")
+        eq_(context["sri"], compress._compute_sri_value("var a;"))
+        ok_(compressor.storage.save.called)
+
+    @patch("mozillians.common.compress.default_storage")
+    def test_verify_sri_manifest(self, storage_mock):
+        files = {"CACHE/js/a.js": b"var a;", "CACHE/js/b.js": b"var c;"}
+        storage_mock.exists.side_effect = lambda path: path in files
+        storage_mock.open.side_effect = lambda path: BytesIO(files[path])
+        compress.reset_sri_manifest(
+            {
+                "CACHE/js/a.js": compress._compute_sri_value("var a;"),
+                "CACHE/js/b.js": compress._compute_sri_value("var b;"),
+                "CACHE/js/c.js": compress._compute_sri_value("var c;"),
+            }
+        )
+        eq_(compress.verify_sri_manifest(), ["CACHE/js/b.js", "CACHE/js/c.js"])
+
+    @override_settings(COMPRESS_ENABLED=True, COMPRESS_OFFLINE=True)
+    @patch("mozillians.common.checks.verify_sri_manifest")
+    def test_check_sri_manifest(self, verify_mock):
+        verify_mock.return_value = ["CACHE/js/b.js"]
+        errors = check_sri_manifest(None)
+        eq_([error.id for error in errors], ["common.E001"])
+
+    @override_settings(COMPRESS_ENABLED=True, COMPRESS_OFFLINE=False)
+    @patch("mozillians.common.checks.verify_sri_manifest")
+    def test_check_sri_manifest_online(self, verify_mock):
+        eq_(check_sri_manifest(None), [])
+        ok_(not verify_mock.called)
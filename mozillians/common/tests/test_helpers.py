@@ -2,10 +2,8 @@ from django.template import engines
 from django.test.utils import override_settings
 from django.utils.timezone import is_aware
 
-from bleach import clean
 from datetime import datetime
-from markdown import markdown
-from mock import patch
+from mock import Mock, patch
 from nose.tools import eq_, ok_
 from pytz import utc
 
@@ -29,15 +27,33 @@ class HelperTests(TestCase):
         )
 
     @patch(
-        "mozillians.common.templatetags.helpers.markdown_module.markdown",
-        wraps=markdown,
+        "mozillians.common.templatetags.helpers.render_markdown",
+        wraps=helpers.render_markdown,
     )
-    @patch("mozillians.common.templatetags.helpers.bleach.clean", wraps=clean)
-    def test_markdown(self, clean_mock, markdown_mock):
+    def test_markdown(self, render_mock):
         returned_text = helpers.markdown("***foo***", allowed_tags=["strong"])
         eq_(returned_text, "<strong>foo</strong>")
-        ok_(clean_mock.called)
-        ok_(markdown_mock.called)
+        render_mock.assert_called_with("***foo***", ["strong"], ("href",), ())
+
+    @patch("mozillians.common.templatetags.helpers.get_template")
+    def test_render_list(self, get_template_mock):
+        get_template_mock.return_value.render.return_value = "<ul></ul>"
+        request = Mock(viewer=Mock(privacy_level=3))
+        t = self.env.from_string('{{ render_list("list.html", items, foo="bar") }}')
+        s = t.render(
+            {"request": request, "user": request.user, "items": [1, 2], "other": 1}
+        )
+        eq_(s, "<ul></ul>")
+        get_template_mock.assert_called_once_with("list.html")
+        get_template_mock.return_value.render.assert_called_once_with(
+            {
+                "request": request,
+                "user": request.user,
+                "privacy_level": 3,
+                "items": [1, 2],
+                "foo": "bar",
+            }
+        )
 
     @override_settings(DEBUG=True)
     def test_display_context(self):
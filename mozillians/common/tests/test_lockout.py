@@ -0,0 +1,81 @@
+from axes.handlers.proxy import AxesProxyHandler
+from axes.models import AccessAttempt
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+
+from nose.tools import eq_, ok_
+
+from mozillians.common.lockout import AxesCacheHandler
+from mozillians.common.tests import TestCase
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    AXES_FAILURE_LIMIT=3,
+)
+class AxesCacheHandlerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.handler = AxesCacheHandler()
+        self.credentials = {"username": "foo"}
+
+    def _request(self, ip_address="127.0.0.1"):
+        # AXES_PROXY_COUNT expects the client address to be followed by a proxy.
+        request = RequestFactory().post(
+            "/login/", HTTP_X_FORWARDED_FOR="{0}, 10.0.0.254".format(ip_address)
+        )
+        AxesProxyHandler.update_request(request)
+        return request
+
+    def _fail(self, times, **kwargs):
+        for i in range(times):
+            request = self._request(**kwargs)
+            self.handler.user_login_failed(
+                None, credentials=self.credentials, request=request
+            )
+        return request
+
+    def test_failures_below_limit_skip_db(self):
+        with self.assertNumQueries(0):
+            self._fail(2)
+            eq_(self.handler.get_failures(self._request(), self.credentials), 2)
+            ok_(not self.handler.is_locked(self._request(), self.credentials))
+
+    def test_lockout_recorded_once(self):
+        self._fail(2)
+        request = self._fail(1)
+        ok_(request.axes_locked_out)
+        ok_(self.handler.is_locked(self._request(), self.credentials))
+        attempt = AccessAttempt.objects.get()
+        eq_(attempt.username, "foo")
+        eq_(attempt.failures_since_start, 3)
+
+        with self.assertNumQueries(0):
+            request = self._fail(1)
+        ok_(request.axes_locked_out)
+
+    def test_lockout_by_user_and_ip(self):
+        self._fail(3)
+        ok_(not self.handler.is_locked(self._request("10.0.0.1"), self.credentials))
+
+    def test_flush_attempts(self):
+        self._fail(2)
+        self._fail(1, ip_address="10.0.0.1")
+        eq_(self.handler.flush_attempts(), 2)
+        eq_(
+            dict(
+                AccessAttempt.objects.values_list("ip_address", "failures_since_start")
+            ),
+            {"127.0.0.1": 2, "10.0.0.1": 1},
+        )
+
+        # Only clients failing since the last flush are flushed again.
+        eq_(self.handler.flush_attempts(), 0)
+        self._fail(1)
+        eq_(self.handler.flush_attempts(), 1)
+        eq_(AccessAttempt.objects.get(ip_address="127.0.0.1").failures_since_start, 3)
+
+    def test_reset_attempts(self):
+        self._fail(3)
+        eq_(self.handler.reset_attempts(username="foo"), 1)
+        eq_(self.handler.get_failures(self._request(), self.credentials), 0)
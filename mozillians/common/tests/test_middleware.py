@@ -1,10 +1,14 @@
+from django.contrib.auth.models import AnonymousUser
 from django.core.urlresolvers import reverse
 from django.test.client import Client
 from django.test.utils import override_settings, override_script_prefix
 
-from nose.tools import eq_
+from nose.tools import eq_, ok_
 
+from mozillians.common.authbackend import MozilliansAuthBackend
+from mozillians.common.middleware import get_viewer
 from mozillians.common.tests import TestCase, requires_login, requires_vouch
+from mozillians.users.managers import MOZILLIANS, PUBLIC
 from mozillians.users.tests import UserFactory
 
 
@@ -112,3 +116,26 @@ class StrongholdTests(TestCase):
         response = client.get(url, follow=True)
         eq_(response.status_code, 200)
         eq_(response.content, "Hi!")
+
+
+class ViewerTests(TestCase):
+    def test_anonymous(self):
+        viewer = get_viewer(AnonymousUser())
+        eq_(viewer.privacy_level, PUBLIC)
+        ok_(not viewer.is_authenticated)
+        ok_(not viewer.is_vouched)
+
+    def test_authenticated_one_query(self):
+        user = UserFactory.create()
+        backend = MozilliansAuthBackend()
+        with self.assertNumQueries(1):
+            viewer = get_viewer(backend.get_user(user.pk))
+        eq_(viewer.privacy_level, MOZILLIANS)
+        ok_(viewer.is_authenticated)
+        ok_(viewer.is_vouched)
+
+    def test_unvouched(self):
+        user = UserFactory.create(vouched=False)
+        viewer = get_viewer(user)
+        eq_(viewer.privacy_level, PUBLIC)
+        ok_(not viewer.is_vouched)
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from mock import patch
+from nose.tools import eq_, ok_
+
+from mozillians.common import sanitize
+from mozillians.common.tests import TestCase
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class RenderMarkdownTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        sanitize._render_markdown.cache_clear()
+
+    def test_render_markdown(self):
+        eq_(
+            sanitize.render_markdown("**foo** <script>bar</script>"),
+            "<p><strong>foo</strong> bar</p>",
+        )
+
+    def test_render_markdown_empty(self):
+        eq_(sanitize.render_markdown(""), "")
+        eq_(sanitize.render_markdown(None), "")
+
+    def test_render_markdown_tags(self):
+        eq_(sanitize.render_markdown("*foo*", tags=["p"]), "<p>foo</p>")
+
+    @patch("mozillians.common.sanitize._get_markdown", wraps=sanitize._get_markdown)
+    def test_render_markdown_cached(self, get_markdown_mock):
+        eq_(sanitize.render_markdown("*foo*"), "<p><em>foo</em></p>")
+        eq_(sanitize.render_markdown("*foo*"), "<p><em>foo</em></p>")
+        eq_(get_markdown_mock.call_count, 1)
+
+        # Other processes find it in the shared cache.
+        sanitize._render_markdown.cache_clear()
+        eq_(sanitize.render_markdown("*foo*"), "<p><em>foo</em></p>")
+        eq_(get_markdown_mock.call_count, 1)
+
+    def test_get_cleaner_reused(self):
+        cleaner = sanitize.get_cleaner(("p",))
+        ok_(sanitize.get_cleaner(("p",)) is cleaner)
+        ok_(sanitize.get_cleaner(("p", "a")) is not cleaner)
+
+    def test_clean_html(self):
+        eq_(
+            sanitize.clean_html('<p>foo</p><a href="/" id="x">bar</a>', ["a"]),
+            'foo<a href="/">bar</a>',
+        )
@@ -0,0 +1,82 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test.utils import override_settings
+
+from mock import Mock, patch
+from nose.tools import eq_, ok_
+from PIL import Image
+
+from mozillians.announcements.models import Announcement
+from mozillians.common import thumbnails
+from mozillians.common.templatetags.helpers import thumbnail
+from mozillians.common.tests import TestCase
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    THUMBNAIL_GEOMETRIES={"announcements.Announcement.image": [("10x10", {})]},
+)
+class ThumbnailsTests(TestCase):
+    def setUp(self):
+        # The key value store of thumbnails is cached.
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        data = BytesIO()
+        Image.new("RGB", (40, 40)).save(data, "JPEG")
+        self.name = default_storage.save("photo.jpg", ContentFile(data.getvalue()))
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_get_geometries(self):
+        announcement = Announcement(image=self.name)
+        eq_(
+            [
+                (image.name, geometries)
+                for image, geometries in thumbnails.get_geometries(announcement)
+            ],
+            [(self.name, [("10x10", {})])],
+        )
+        eq_(list(thumbnails.get_geometries(Announcement())), [])
+
+    def test_generate_thumbnails(self):
+        eq_(thumbnails.get_cached_thumbnail(self.name, "10x10"), None)
+        eq_(thumbnails.generate_thumbnails(self.name, [("10x10", {})]), 1)
+        cached = thumbnails.get_cached_thumbnail(self.name, "10x10")
+        ok_(cached is not None)
+        eq_((cached.width, cached.height), (10, 10))
+
+    def test_pregenerate_thumbnails(self):
+        executor = Mock()
+        announcement = Announcement(image=self.name)
+        thumbnails.pregenerate_thumbnails(
+            thumbnails.get_geometries(announcement), executor=executor
+        )
+        executor.submit.assert_called_with(
+            thumbnails.generate_thumbnails, self.name, [("10x10", {})]
+        )
+
+    def test_generate_thumbnails_locked(self):
+        cache.add(thumbnails._lock_key(self.name, "10x10"), True)
+        eq_(thumbnails.generate_thumbnails(self.name, [("10x10", {})]), 0)
+        eq_(thumbnails.get_cached_thumbnail(self.name, "10x10"), None)
+
+    @patch("mozillians.common.thumbnails.get_thumbnail")
+    def test_thumbnail_placeholder(self, get_thumbnail_mock):
+        placeholder = thumbnail(self.name, "10x10")
+        ok_(isinstance(placeholder, thumbnails.PlaceholderImageFile))
+        ok_(placeholder.url.endswith("/img/thumbnail-placeholder.png"))
+        eq_(placeholder.width, 10)
+        ok_(not get_thumbnail_mock.called)
+
+    def test_thumbnail_pregenerated(self):
+        thumbnails.generate_thumbnails(self.name, [("10x10", {"crop": "center"})])
+        eq_(thumbnail(self.name, "10x10", crop="center").height, 10)
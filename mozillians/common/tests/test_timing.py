@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from mock import Mock
+from nose.tools import eq_, ok_
+
+from mozillians.common.authbackend import JWKS_HITS_KEY, JWKS_MISSES_KEY
+from mozillians.common.tests import TestCase
+from mozillians.common.timing import (
+    StageMiddleware,
+    Timer,
+    TimingMiddleware,
+    get_bucket,
+    get_timer,
+)
+from mozillians.users.models import UserProfile
+
+
+class TimerTests(TestCase):
+    def test_self_time(self):
+        timer = Timer(["outer", "view"])
+        timer.enter("outer")
+        timer.enter_next_stage()
+        eq_(timer.current, "view")
+        timer.exit()
+        timer.exit()
+        eq_(set(timer.stats), set(["outer", "view"]))
+        ok_(timer.total >= timer.stats["outer"][0] + timer.stats["view"][0])
+
+    def test_bucket(self):
+        eq_(get_bucket(0.3), "1")
+        eq_(get_bucket(3), "5")
+        eq_(get_bucket(10**6), "inf")
+
+
+@override_settings(
+    MIDDLEWARE=[
+        "mozillians.common.timing.TimingMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "mozillians.common.timing.StageMiddleware",
+    ],
+    TIMING_FLUSH_INTERVAL=3600,
+)
+class TimingMiddlewareTests(TestCase):
+    def _view(self, request):
+        eq_(get_timer().current, "view")
+        UserProfile.objects.count()
+        return HttpResponse()
+
+    def _get(self, is_staff):
+        request = RequestFactory().get("/")
+        request.user = Mock(is_staff=is_staff)
+        middleware = TimingMiddleware(lambda r: StageMiddleware(self._view)(r))
+        return middleware(request)
+
+    def test_server_timing_for_staff(self):
+        header = self._get(is_staff=True)["Server-Timing"]
+        ok_(header.startswith("SessionMiddleware;dur="))
+        ok_("view;dur=" in header)
+        ok_('desc="1 queries' in header)
+        ok_("total;dur=" in header)
+
+    def test_no_server_timing(self):
+        ok_(not self._get(is_staff=False).has_header("Server-Timing"))
+        eq_(get_timer(), None)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TimingReportTests(TestCase):
+    def test_jwks_hit_rate(self):
+        cache.set_many({JWKS_HITS_KEY: 3, JWKS_MISSES_KEY: 1})
+        out = StringIO()
+        call_command("timing_report", reset=True, stdout=out)
+        ok_("JWKS cache: 3 hits, 1 misses (75.0% hit rate)" in out.getvalue())
+        eq_(cache.get(JWKS_HITS_KEY), None)
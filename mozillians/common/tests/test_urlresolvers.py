@@ -0,0 +1,54 @@
+from django.test import RequestFactory
+from django.test.utils import override_script_prefix
+from django.urls import NoReverseMatch
+from django.urls import reverse as django_reverse
+
+from nose.tools import eq_, ok_, raises
+
+from mozillians.common import urlresolvers
+from mozillians.common.tests import TestCase
+
+
+class ReverseTests(TestCase):
+    def tearDown(self):
+        urlresolvers.set_url_prefix(None)
+
+    def test_matches_django_reverse(self):
+        for username in ["foo", "foo.bar@example.com", "Ünïcode", "12"]:
+            eq_(
+                urlresolvers.reverse("phonebook:profile_view", args=[username]),
+                django_reverse("phonebook:profile_view", args=[username]),
+            )
+            eq_(
+                urlresolvers.reverse(
+                    "phonebook:profile_view", kwargs={"username": username}
+                ),
+                django_reverse("phonebook:profile_view", args=[username]),
+            )
+
+    def test_locale_prefix(self):
+        urlresolvers.set_url_prefix(urlresolvers.Prefixer(RequestFactory().get("/")))
+        eq_(
+            urlresolvers.reverse("phonebook:profile_view", args=["foo"]),
+            "/en-US/u/foo/",
+        )
+
+    def test_script_prefix(self):
+        urlresolvers.reverse("phonebook:profile_view", args=["foo"])
+        with override_script_prefix("/mozillians/"):
+            eq_(
+                urlresolvers.reverse("phonebook:profile_view", args=["foo"]),
+                "/mozillians/u/foo/",
+            )
+
+    @raises(NoReverseMatch)
+    def test_invalid_argument(self):
+        urlresolvers.reverse("phonebook:profile_view", args=["foo/bar"])
+
+    def test_builder_is_reused(self):
+        builder = urlresolvers.get_url_builder("phonebook:profile_view", None, 1, ())
+        ok_(builder is not None)
+        ok_(
+            builder
+            is urlresolvers.get_url_builder("phonebook:profile_view", None, 1, ())
+        )
@@ -0,0 +1,117 @@
+import logging
+from hashlib import sha1
+
+from django.conf import settings
+from django.core.cache import cache
+from django.templatetags.static import static
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.conf import defaults as sorl_defaults
+from sorl.thumbnail.conf import settings as sorl_settings
+from sorl.thumbnail.images import DummyImageFile, ImageFile
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_LOCK_KEY = "thumbnail_lock:{0}"
+# Seconds a thumbnail is reserved for the process generating it.
+THUMBNAIL_LOCK_TIMEOUT = 60
+
+
+class PlaceholderImageFile(DummyImageFile):
+    """Dummy image of the size of a thumbnail, served from our static files.
+
+    sorl's dummy image comes from an external host, which CSP blocks.
+    """
+
+    @property
+    def url(self):
+        return static(settings.THUMBNAIL_PLACEHOLDER)
+
+
+def get_geometries(instance):
+    """Return (image, geometries) for the image fields of instance.
+
+    Only the fields listed in THUMBNAIL_GEOMETRIES that hold an image are
+    returned.
+    """
+    label = instance._meta.label
+    for key, geometries in settings.THUMBNAIL_GEOMETRIES.items():
+        model, field = key.rsplit(".", 1)
+        image = getattr(instance, field, None) if model == label else None
+        if image:
+            yield image, geometries
+
+
+def _lock_key(name, geometry):
+    digest = sha1("{0}:{1}".format(name, geometry).encode("utf-8")).hexdigest()
+    return THUMBNAIL_LOCK_KEY.format(digest)
+
+
+def generate_thumbnails(name, geometries):
+    """Generate the thumbnails of the image stored at name.
+
+    Thumbnails another process is generating already are skipped. Returns
+    the number of thumbnails generated.
+    """
+    count = 0
+    for geometry, options in geometries:
+        lock_key = _lock_key(name, geometry)
+        if not cache.add(lock_key, True, THUMBNAIL_LOCK_TIMEOUT):
+            continue
+        try:
+            get_thumbnail(name, geometry, **options)
+        except Exception:
+            logger.exception("Could not generate %s thumbnail of %s", geometry, name)
+        else:
+            count += 1
+        finally:
+            cache.delete(lock_key)
+    return count
+
+
+def pregenerate_thumbnails(sources, executor):
+    """Queue the generation of thumbnails in executor, return the futures.
+
+    sources is an iterable of (image, geometries) where image is a file
+    or its name and geometries a list of (geometry, options) as given to
+    get_thumbnail().
+    """
+    return [
+        executor.submit(
+            generate_thumbnails, getattr(image, "name", image), list(geometries)
+        )
+        for image, geometries in sources
+    ]
+
+
+def get_cached_thumbnail(image, geometry, **options):
+    """Return the thumbnail of image if it was generated already, or None.
+
+    Only the key value store is looked up, the image is never opened.
+    """
+    backend = default.backend
+    source = ImageFile(image)
+    # Same defaults as ThumbnailBackend.get_thumbnail(), they are part of
+    # the thumbnail name.
+    if sorl_settings.THUMBNAIL_PRESERVE_FORMAT:
+        options.setdefault("format", backend._get_format(source))
+    for key, value in backend.default_options.items():
+        options.setdefault(key, value)
+    for key, attr in backend.extra_options:
+        value = getattr(sorl_settings, attr)
+        if value != getattr(sorl_defaults, attr):
+            options.setdefault(key, value)
+
+    name = backend._get_thumbnail_filename(source, geometry, options)
+    return default.kvstore.get(ImageFile(name, default.storage))
+
+
+def get_thumbnail_or_placeholder(image, geometry, **options):
+    """Return the pregenerated thumbnail of image, or a placeholder.
+
+    Thumbnails are generated when images are saved and by the
+    pregenerate_thumbnails command, never in the request.
+    """
+    thumbnail = get_cached_thumbnail(image, geometry, **dict(options))
+    if thumbnail is None:
+        thumbnail = PlaceholderImageFile(geometry)
+    return thumbnail
@@ -0,0 +1,263 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends import memcached
+from django.db import connection
+from django_jinja import backend
+
+# Upper bounds of the histogram buckets, in ms.
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+HISTOGRAM_KEY = "timing:{0}:{1}"
+HISTOGRAM_VIEWS_KEY = "timing:views"
+
+CACHE_METHODS = (
+    "get",
+    "set",
+    "add",
+    "delete",
+    "get_many",
+    "set_many",
+    "delete_many",
+    "incr",
+    "decr",
+    "touch",
+)
+
+_local = threading.local()
+
+
+def get_timer():
+    """Return the Timer of the current request, or None."""
+    return getattr(_local, "timer", None)
+
+
+def get_stage_names():
+    names = [
+        path.rsplit(".", 1)[1]
+        for path in settings.MIDDLEWARE
+        if not path.startswith(__name__ + ".")
+    ]
+    return names + ["view"]
+
+
+def get_bucket(ms):
+    index = bisect_left(HISTOGRAM_BUCKETS, ms)
+    return str(HISTOGRAM_BUCKETS[index]) if index < len(HISTOGRAM_BUCKETS) else "inf"
+
+
+class Timer(object):
+    """Self time, DB queries, query time and cache calls per stage."""
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.stats = {}
+        self.stack = []
+        self.current = None
+        self.start = self.mark = time.perf_counter()
+        self.total = 0.0
+
+    def _stats(self, stage):
+        try:
+            return self.stats[stage]
+        except KeyError:
+            stats = self.stats[stage] = [0.0, 0, 0.0, 0]
+            return stats
+
+    def enter(self, stage):
+        now = time.perf_counter()
+        if self.current is not None:
+            self._stats(self.current)[0] += now - self.mark
+        self.stack.append(self.current)
+        self.current = stage
+        self.mark = now
+
+    def exit(self):
+        now = time.perf_counter()
+        self._stats(self.current)[0] += now - self.mark
+        self.current = self.stack.pop()
+        self.mark = now
+        if self.current is None:
+            self.total = now - self.start
+
+    def enter_next_stage(self):
+        """Enter the stage following the one nested deepest so far."""
+        self.enter(self.stages[min(len(self.stack), len(self.stages) - 1)])
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats = self._stats(self.current)
+            stats[1] += 1
+            stats[2] += time.perf_counter() - start
+
+    def count_cache_call(self):
+        self._stats(self.current)[3] += 1
+
+    def server_timing(self):
+        entries = []
+        for stage, stats in self.stats.items():
+            duration, queries, query_time, cache_calls = stats
+            entries.append(
+                '{0};dur={1:.2f};desc="{2} queries ({3:.2f}ms) {4} cache calls"'.format(
+                    stage, duration * 1000, queries, query_time * 1000, cache_calls
+                )
+            )
+        entries.append("total;dur={0:.2f}".format(self.total * 1000))
+        return ", ".join(entries)
+
+
+class Histograms(object):
+    """Stage durations counted in-process and flushed to the cache."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.views = set()
+        self.flushed = time.time()
+
+    def record(self, timer, view_name=None):
+        samples = [(stage, stats[0]) for stage, stats in timer.stats.items()]
+        samples.append(("total", timer.total))
+        if view_name:
+            samples.append(("view:" + view_name, timer.stats.get("view", [0.0])[0]))
+
+        with self.lock:
+            for stage, duration in samples:
+                self.counts[(stage, get_bucket(duration * 1000))] += 1
+            if view_name:
+                self.views.add(view_name)
+            now = time.time()
+            if now - self.flushed < settings.TIMING_FLUSH_INTERVAL:
+                return
+            counts, self.counts = self.counts, Counter()
+            views, self.views = self.views, set()
+            self.flushed = now
+        self.flush(counts, views)
+
+    def flush(self, counts, views):
+        for (stage, bucket), count in counts.items():
+            key = HISTOGRAM_KEY.format(stage, bucket)
+            cache.add(key, 0, None)
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                cache.set(key, count, None)
+        known_views = cache.get(HISTOGRAM_VIEWS_KEY, set())
+        if not views <= known_views:
+            cache.set(HISTOGRAM_VIEWS_KEY, known_views | views, None)
+
+
+histograms = Histograms()
+
+
+class TimingMiddleware(object):
+    """Time every stage of the request.
+
+    With TIMING_ENABLED, every entry of settings.MIDDLEWARE is followed by
+    a StageMiddleware and this middleware wraps them all. Each stage (a
+    middleware, the view and template rendering) gets its own wall time,
+    DB queries and cache calls, not counting the stages nested in it.
+    Staff get them in a Server-Timing header and the durations are
+    aggregated in histograms, reported by ./manage.py timing_report.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.stages = get_stage_names()
+
+    def __call__(self, request):
+        timer = _local.timer = Timer(self.stages)
+        try:
+            with connection.execute_wrapper(timer.execute_wrapper):
+                timer.enter(self.stages[0])
+                try:
+                    response = self.get_response(request)
+                finally:
+                    timer.exit()
+        finally:
+            _local.timer = None
+
+        match = getattr(request, "resolver_match", None)
+        histograms.record(timer, match.view_name if match else None)
+
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            response["Server-Timing"] = timer.server_timing()
+        return response
+
+
+class StageMiddleware(object):
+    """Time the middleware, or the view, nested in this one."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = get_timer()
+        if timer is None:
+            return self.get_response(request)
+
+        timer.enter_next_stage()
+        try:
+            return self.get_response(request)
+        finally:
+            timer.exit()
+
+
+def _count_cache_call(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        timer = get_timer()
+        if timer is not None:
+            timer.count_cache_call()
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+class MemcachedCache(memcached.MemcachedCache):
+    """MemcachedCache counting calls in the timer of the current request."""
+
+
+for _name in CACHE_METHODS:
+    setattr(
+        MemcachedCache,
+        _name,
+        _count_cache_call(getattr(memcached.MemcachedCache, _name)),
+    )
+
+
+class Template(object):
+    """Time the rendering of a django_jinja template."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        timer = get_timer()
+        if timer is None:
+            return self.template.render(context, request)
+
+        timer.enter("template")
+        try:
+            return self.template.render(context, request)
+        finally:
+            timer.exit()
+
+
+class Jinja2(backend.Jinja2):
+    def from_string(self, template_code):
+        return Template(super(Jinja2, self).from_string(template_code))
+
+    def get_template(self, template_name):
+        return Template(super(Jinja2, self).get_template(template_name))
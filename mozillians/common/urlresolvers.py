@@ -1,9 +1,23 @@
+import re
+from functools import lru_cache
 from threading import local
+from urllib.parse import quote, unquote
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import (
+    NoReverseMatch,
+    Resolver404,
+    get_resolver,
+    get_script_prefix,
+    get_urlconf,
+    resolve,
+)
 from django.urls import reverse as django_reverse
 from django.utils.encoding import iri_to_uri
 from django.utils.functional import lazy
+from django.utils.http import RFC3986_SUBDELIMS, escape_leading_slashes
 
 # Thread-local storage for URL prefixes. Access with (get|set)_url_prefix.
 _local = local()
@@ -19,13 +33,119 @@ def get_url_prefix():
     return getattr(_local, "prefix", None)
 
 
+# Stand-ins for URL arguments while building URL templates. They have to
+# match the argument patterns, so try a word and a number.
+URL_ARG_SENTINELS = ("urlarg{0}x", "98765{0}56789")
+
+
+class URLBuilder(object):
+    """Build the path of a URL pattern from a template resolved once.
+
+    Arguments are validated against the pattern and quoted the way
+    Django's reverse() does it.
+    """
+
+    def __init__(self, parts, order, route):
+        self.parts = parts
+        self.raw_parts = [unquote(part) for part in parts]
+        self.order = order
+        self.route = re.compile(route)
+
+    def __call__(self, values):
+        """Return the path for values, or None if they don't match the pattern."""
+        texts = [str(values[i]) for i in self.order]
+        raw = [self.raw_parts[0]]
+        path = [self.parts[0]]
+        for text, raw_part, part in zip(texts, self.raw_parts[1:], self.parts[1:]):
+            raw += [text, raw_part]
+            path += [quote(text, safe=RFC3986_SUBDELIMS + "/~:@"), part]
+        if not self.route.match("".join(raw)[1:]):
+            return None
+        return escape_leading_slashes("".join(path))
+
+
+@lru_cache(maxsize=None)
+def get_url_builder(viewname, urlconf, nargs, kwarg_names):
+    """Return a URLBuilder for viewname called with nargs or kwarg_names.
+
+    Returns None if the URL cannot be reversed from a single regex
+    pattern, in which case reverse() falls back to Django's reverse.
+    """
+    resolver = get_resolver(urlconf)
+    namespaces = viewname.split(":")
+    view = namespaces.pop()
+    try:
+        for namespace in namespaces:
+            resolver = resolver.namespace_dict[namespace][1]
+    except KeyError:
+        return None
+    if len(resolver.reverse_dict.getlist(view)) != 1:
+        return None
+
+    for sentinel in URL_ARG_SENTINELS:
+        subs = [sentinel.format(i) for i in range(len(kwarg_names) or nargs)]
+        try:
+            if kwarg_names:
+                path = django_reverse(
+                    viewname, urlconf, kwargs=dict(zip(kwarg_names, subs))
+                )
+            else:
+                path = django_reverse(viewname, urlconf, args=subs)
+        except NoReverseMatch:
+            continue
+        # Keep the template independent of the script prefix, which always
+        # ends with a slash.
+        script_prefix_length = len(get_script_prefix()) - 1
+        path = path[script_prefix_length:]
+
+        try:
+            route = resolve(path, urlconf).route
+        except Resolver404:
+            return None
+        if not re.match(route, path[1:]):
+            # Not a regex pattern.
+            return None
+        positions = sorted((path.index(sub), i) for i, sub in enumerate(subs))
+        if any(path.count(sub) != 1 for sub in subs):
+            return None
+
+        parts = []
+        start = 0
+        for position, i in positions:
+            parts.append(path[start:position])
+            start = position + len(subs[i])
+        parts.append(path[start:])
+        return URLBuilder(parts, [i for position, i in positions], route)
+    return None
+
+
+@receiver(setting_changed)
+def clear_url_builders(setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        get_url_builder.cache_clear()
+
+
 def reverse(viewname, urlconf=None, args=None, kwargs=None, prefix=None):
     """Wraps Django's reverse to prepend the correct locale."""
     prefixer = get_url_prefix()
 
-    if prefixer:
-        prefix = prefix or "/"
-    url = django_reverse(viewname, urlconf, args, kwargs, prefix)
+    path = None
+    if prefix is None and isinstance(viewname, str) and not (args and kwargs):
+        kwarg_names = tuple(sorted(kwargs or ()))
+        builder = get_url_builder(
+            viewname, urlconf or get_urlconf(), len(args or ()), kwarg_names
+        )
+        if builder is not None:
+            path = builder([kwargs[name] for name in kwarg_names] or args or ())
+
+    if path is None:
+        if prefixer:
+            prefix = prefix or "/"
+        url = django_reverse(viewname, urlconf, args, kwargs, prefix)
+    elif prefixer:
+        url = path
+    else:
+        url = get_script_prefix() + path[1:]
     if prefixer:
         url = prefixer.fix(url)
 
@@ -44,6 +164,34 @@ def find_supported(test):
     ]
 
 
+@lru_cache(maxsize=None)
+def get_locale_aliases():
+    """Map lowercased URL locales to supported locales.
+
+    Language fallbacks are keyed as "<language>-" and map to the first
+    supported locale of that language, the one find_supported() returns.
+    """
+    aliases = dict(settings.LANGUAGE_URL_MAP)
+    for lang, locale in settings.LANGUAGE_URL_MAP.items():
+        aliases.setdefault(lang.split("-", 1)[0] + "-", locale)
+    return aliases
+
+
+@lru_cache(maxsize=None)
+def get_exempt_l10n_re():
+    """Compile EXEMPT_L10N_URLS into a single regex."""
+    return re.compile("|".join("(?:%s)" % url for url in settings.EXEMPT_L10N_URLS))
+
+
+@receiver(setting_changed)
+def clear_locale_caches(setting, **kwargs):
+    if setting in ("LANGUAGE_URL_MAP", "EXEMPT_L10N_URLS"):
+        get_locale_aliases.cache_clear()
+        get_exempt_l10n_re.cache_clear()
+        split_path.cache_clear()
+
+
+@lru_cache(maxsize=1024)
 def split_path(path_):
     """
     Split the requested path into (locale, path).
@@ -55,15 +203,12 @@ def split_path(path_):
     # Use partitition instead of split since it always returns 3 parts
     first, _, rest = path.partition("/")
 
+    aliases = get_locale_aliases()
     lang = first.lower()
-    if lang in settings.LANGUAGE_URL_MAP:
-        return settings.LANGUAGE_URL_MAP[lang], rest
-    else:
-        supported = find_supported(first)
-        if len(supported):
-            return supported[0], rest
-        else:
-            return "", path
+    locale = aliases.get(lang) or aliases.get(lang.split("-", 1)[0] + "-")
+    if locale:
+        return locale, rest
+    return "", path
 
 
 class Prefixer(object):
@@ -1,8 +1,12 @@
+from functools import lru_cache
+
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 
-def absolutify(url):
-    """Takes a URL and prepends the SITE_URL"""
+@lru_cache(maxsize=None)
+def get_site_url():
     site_url = getattr(settings, "SITE_URL", False)
 
     # If we don't define it explicitly
@@ -14,5 +18,15 @@ def absolutify(url):
             site_url = "".join(map(str, (protocol, hostname)))
         else:
             site_url = "".join(map(str, (protocol, hostname, ":", port)))
+    return site_url
+
 
-    return site_url + url
+@receiver(setting_changed)
+def clear_site_url(setting, **kwargs):
+    if setting in ("SITE_URL", "PROTOCOL", "DOMAIN", "PORT"):
+        get_site_url.cache_clear()
+
+
+def absolutify(url):
+    """Takes a URL and prepends the SITE_URL"""
+    return get_site_url() + url
@@ -0,0 +1,85 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+BASELINE = (
+    "django.contrib.sessions.backends.db",
+    "django.contrib.messages.storage.session.SessionStorage",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure DB queries and latency of anonymous and authenticated profile "
+        "views, for the baseline and the configured session/message storage."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="Username of the profile to view.")
+        parser.add_argument(
+            "--viewer",
+            default=None,
+            help="Username to log in as. Defaults to the viewed user.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20,
+            help="Number of requests measured per configuration.",
+        )
+        parser.add_argument(
+            "--host", default="localhost", help="Host header sent with requests."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            viewer = User.objects.get(username=options["viewer"] or options["username"])
+        except User.DoesNotExist:
+            raise CommandError("Unknown viewer.")
+        url = (
+            "/"
+            + settings.LANGUAGE_CODE
+            + reverse(
+                "phonebook:profile_view", kwargs={"username": options["username"]}
+            )
+        )
+
+        configured = (settings.SESSION_ENGINE, settings.MESSAGE_STORAGE)
+        for label, (engine, storage) in (("before", BASELINE), ("after", configured)):
+            with override_settings(SESSION_ENGINE=engine, MESSAGE_STORAGE=storage):
+                for user in (None, viewer):
+                    client = Client(HTTP_HOST=options["host"])
+                    if user:
+                        client.force_login(user)
+                    status, queries, elapsed = self.measure(
+                        client, url, options["requests"]
+                    )
+                    self.stdout.write(
+                        "%-6s %-13s %d %5.1f queries/request %7.1fms/request  (%s, %s)"
+                        % (
+                            label,
+                            "authenticated" if user else "anonymous",
+                            status,
+                            queries,
+                            elapsed,
+                            engine.rsplit(".", 1)[1],
+                            storage.rsplit(".", 1)[1],
+                        )
+                    )
+
+    def measure(self, client, url, count):
+        # Warm up caches and the session before measuring.
+        status = client.get(url, secure=True).status_code
+
+        start = time.time()
+        with CaptureQueriesContext(connection) as context:
+            for i in range(count):
+                client.get(url, secure=True)
+        elapsed = (time.time() - start) * 1000
+        return status, float(len(context)) / count, elapsed / count
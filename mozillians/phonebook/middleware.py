@@ -1,8 +1,8 @@
-from django.contrib.auth.models import User
 from django.http import HttpResponseRedirect
 from django.urls import is_valid_path
 
 from mozillians.common.middleware import safe_query_string
+from mozillians.users.usernames import username_exists
 
 
 class UsernameRedirectionMiddleware(object):
@@ -22,12 +22,9 @@ class UsernameRedirectionMiddleware(object):
         if (
             response.status_code == 404
             and not request.path_info.startswith("/u/")
+            and request.viewer.is_vouched
+            and username_exists(request.path_info[1:].strip("/"))
             and not is_valid_path(request.path_info)
-            and User.objects.filter(
-                username__iexact=request.path_info[1:].strip("/")
-            ).exists()
-            and request.user.is_authenticated
-            and request.user.userprofile.is_vouched
         ):
 
             newurl = "/u" + request.path_info
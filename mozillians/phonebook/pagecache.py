@@ -0,0 +1,126 @@
+import uuid
+from hashlib import sha1
+from itertools import chain
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+
+PROFILE_PAGE_KEY = "profile_page:{0}:{1}"
+PROFILE_VERSION_KEY = "profile_version:{0}"
+VOUCHES_VERSION_KEY = "vouches_version:{0}"
+
+
+def _page_key(username):
+    digest = sha1(username.encode("utf-8")).hexdigest()
+    return PROFILE_PAGE_KEY.format(get_language(), digest)
+
+
+def is_page_cacheable(request):
+    """Whether the profile page for request may come from the page cache.
+
+    Only requests without a session qualify, which leaves out authenticated
+    users and anyone with pending messages, and without a query string.
+    """
+    return (
+        settings.PROFILE_PAGE_CACHE_TIMEOUT > 0
+        and not request.GET
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def get_profile_version(profile_id):
+    """Return the current version of the pages of a profile.
+
+    It changes with the user, identities and vouches of the profile.
+    """
+    return _get_version(PROFILE_VERSION_KEY.format(profile_id))
+
+
+def invalidate_profile_pages(*profile_ids):
+    """Make the cached pages and ETags of profiles stale."""
+    cache.delete_many([PROFILE_VERSION_KEY.format(pk) for pk in profile_ids])
+
+
+def get_vouches_version(profile_id):
+    """Return the current version of the vouches made and received by a profile."""
+    return _get_version(VOUCHES_VERSION_KEY.format(profile_id))
+
+
+def invalidate_vouches(*profile_ids):
+    """Make the cached vouch sections of profiles stale."""
+    cache.delete_many([VOUCHES_VERSION_KEY.format(pk) for pk in profile_ids])
+
+
+def get_vouch_related_ids(profile_ids):
+    """Return the ids of the profiles vouched for by, or vouching for, profile_ids.
+
+    Their pages show profile_ids in the vouch sections.
+    """
+    Vouch = apps.get_model("users", "Vouch")
+    pairs = Vouch.objects.filter(
+        Q(voucher__in=profile_ids) | Q(vouchee__in=profile_ids)
+    ).values_list("voucher_id", "vouchee_id")
+    return set(chain.from_iterable(pairs)) - set(profile_ids) - set([None])
+
+
+def get_profile_etag(request, profile, version, vouches_version, privacy_level):
+    """Return the ETag of the page of profile as rendered for request.
+
+    Besides the profile and its version, the page depends on the profiles
+    in its vouch sections, the latest announcement, the viewer, the privacy
+    level it is shown at, the query string and the language.
+    """
+    Announcement = apps.get_model("announcements", "Announcement")
+    announcement = Announcement.objects.latest_published()
+    parts = [
+        version,
+        vouches_version,
+        profile.last_updated.isoformat(),
+        privacy_level,
+        request.GET.urlencode(),
+        get_language(),
+    ]
+    if announcement is not None:
+        parts += [announcement.pk, announcement.updated.isoformat()]
+    if request.user.is_authenticated:
+        viewer_profile = request.user.userprofile
+        parts += [viewer_profile.pk, viewer_profile.last_updated.isoformat()]
+    digest = sha1(":".join(str(part) for part in parts).encode("utf-8"))
+    return quote_etag(digest.hexdigest())
+
+
+def get_cached_page(username):
+    """Return the cached response for the profile of username, or None."""
+    entry = cache.get(_page_key(username))
+    if entry is None:
+        return None
+    version = cache.get(PROFILE_VERSION_KEY.format(entry["profile_id"]))
+    if version != entry["version"]:
+        return None
+    return entry["response"]
+
+
+def set_cached_page(username, profile_id, version, response):
+    """Cache response as the page of username.
+
+    version is read by get_profile_version() right after the profile, so
+    that changes committed while the page renders leave it stale.
+    """
+    cache.set(
+        _page_key(username),
+        {"profile_id": profile_id, "version": version, "response": response},
+        settings.PROFILE_PAGE_CACHE_TIMEOUT,
+    )
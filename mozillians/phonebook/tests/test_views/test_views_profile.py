@@ -1,11 +1,17 @@
+from datetime import timedelta
+
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import Client
 from django.test.utils import override_settings
+from django.utils import timezone
 
 from mock import patch
 from nose.tools import ok_, eq_
 
+from mozillians.announcements.models import Announcement
+from mozillians.announcements.tests import AnnouncementFactory
 from mozillians.common.templatetags.helpers import redirect, urlparams
 from mozillians.common.tests import TestCase
 from mozillians.users.managers import PUBLIC, MOZILLIANS, EMPLOYEES, PRIVATE
@@ -230,3 +236,235 @@ class ViewProfileTests(TestCase):
         with self.login(user) as client:
             response = client.get(url, follow=True)
         ok_("vouch_form" in response.context)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ViewProfileQueriesTests(TestCase):
+    """The profile is resolved in one query, identities in one more."""
+
+    def setUp(self):
+        cache.clear()
+        # The latest announcement is part of the ETag, cache it up front.
+        Announcement.objects.latest_published()
+
+    def test_anonymous(self):
+        lookup_user = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        url = reverse(
+            "phonebook:profile_view", kwargs={"username": lookup_user.username}
+        )
+        # The profile, its identities, its vouchers and its vouchees.
+        with self.assertNumQueries(4):
+            response = Client().get(url, follow=True)
+        eq_(response.status_code, 200)
+
+    def test_vouched(self):
+        lookup_user = UserFactory.create()
+        user = UserFactory.create()
+        url = reverse(
+            "phonebook:profile_view", kwargs={"username": lookup_user.username}
+        )
+        client = Client()
+        client.force_login(user)
+        # The user and profile of the viewer, then as above.
+        with self.assertNumQueries(6):
+            response = client.get(url, follow=True)
+        eq_(response.status_code, 200)
+
+    def test_self(self):
+        user = UserFactory.create()
+        url = reverse("phonebook:profile_view", kwargs={"username": user.username})
+        client = Client()
+        client.force_login(user)
+        with self.assertNumQueries(6):
+            response = client.get(url, follow=True)
+        eq_(response.status_code, 200)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    PROFILE_PAGE_CACHE_TIMEOUT=60,
+)
+class ProfilePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.lookup_user = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        self.url = reverse(
+            "phonebook:profile_view", kwargs={"username": self.lookup_user.username}
+        )
+
+    def test_anonymous_cached(self):
+        response = Client().get(self.url, follow=True)
+        with self.assertNumQueries(0):
+            cached_response = Client().get(self.url, follow=True)
+        eq_(cached_response.status_code, 200)
+        eq_(cached_response.content, response.content)
+        ok_("no-cache" in cached_response["Cache-Control"])
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    def test_invalidated_on_save(self):
+        Client().get(self.url, follow=True)
+        profile = self.lookup_user.userprofile
+        profile.full_name = "Foo Bar"
+        profile.save()
+        response = Client().get(self.url, follow=True)
+        ok_(b"Foo Bar" in response.content)
+
+    def test_authenticated_bypass(self):
+        Client().get(self.url, follow=True)
+        client = Client()
+        client.force_login(UserFactory.create())
+        with self.assertNumQueries(6):
+            client.get(self.url, follow=True)
+
+    @override_settings(PROFILE_PAGE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        Client().get(self.url, follow=True)
+        # The profile and its identities, the vouches are cached.
+        with self.assertNumQueries(2):
+            Client().get(self.url, follow=True)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ViewProfileConditionalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.lookup_user = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        self.url = reverse(
+            "phonebook:profile_view", kwargs={"username": self.lookup_user.username}
+        )
+
+    def test_not_modified(self):
+        response = Client().get(self.url, follow=True)
+        ok_("private" in response["Cache-Control"])
+        etag = response["ETag"]
+        with self.assertNumQueries(1):
+            response = Client().get(self.url, follow=True, HTTP_IF_NONE_MATCH=etag)
+        eq_(response.status_code, 304)
+        eq_(response["ETag"], etag)
+        ok_("private" in response["Cache-Control"])
+
+    def test_etag_per_viewer(self):
+        etag = Client().get(self.url, follow=True)["ETag"]
+        client = Client()
+        client.force_login(UserFactory.create())
+        response = client.get(self.url, follow=True, HTTP_IF_NONE_MATCH=etag)
+        eq_(response.status_code, 200)
+        ok_(response["ETag"] != etag)
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    def test_etag_changes_with_vouches(self):
+        etag = Client().get(self.url, follow=True)["ETag"]
+        self.lookup_user.userprofile.vouches_received.create(
+            voucher=UserFactory.create().userprofile,
+            date=timezone.now(),
+            description="Foo",
+        )
+        response = Client().get(self.url, follow=True, HTTP_IF_NONE_MATCH=etag)
+        eq_(response.status_code, 200)
+
+    @patch("mozillians.announcements.signals.transaction.on_commit", lambda func: func())
+    def test_etag_changes_with_announcement(self):
+        etag = Client().get(self.url, follow=True)["ETag"]
+        AnnouncementFactory.create(publish_from=timezone.now() - timedelta(minutes=1))
+        response = Client().get(self.url, follow=True, HTTP_IF_NONE_MATCH=etag)
+        eq_(response.status_code, 200)
+
+    @override_settings(PROFILE_PAGE_CACHE_TIMEOUT=60)
+    def test_not_modified_from_page_cache(self):
+        etag = Client().get(self.url, follow=True)["ETag"]
+        with self.assertNumQueries(0):
+            response = Client().get(self.url, follow=True, HTTP_IF_NONE_MATCH=etag)
+        eq_(response.status_code, 304)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ViewProfileVouchesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.voucher = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        self.url = reverse(
+            "phonebook:profile_view", kwargs={"username": self.voucher.username}
+        )
+
+    def _vouch(self, vouchee):
+        return vouchee.userprofile.vouches_received.create(
+            voucher=self.voucher.userprofile,
+            date=timezone.now(),
+            description="Foo",
+        )
+
+    def test_fragment_cached_per_privacy_level(self):
+        vouchee = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        self._vouch(vouchee)
+        Client().get(self.url, follow=True)
+        # The profile and its identities only.
+        with self.assertNumQueries(2):
+            response = Client().get(self.url, follow=True)
+        ok_(vouchee.userprofile.full_name.encode("utf-8") in response.content)
+
+        client = Client()
+        client.force_login(UserFactory.create())
+        # The user and profile of the viewer, the profile, its identities,
+        # its vouchers and its vouchees.
+        with self.assertNumQueries(6):
+            client.get(self.url, follow=True)
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    def test_fragment_invalidated_by_vouch(self):
+        Client().get(self.url, follow=True)
+        vouchee = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        self._vouch(vouchee)
+        response = Client().get(self.url, follow=True)
+        ok_(vouchee.userprofile.full_name.encode("utf-8") in response.content)
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    def test_fragment_invalidated_by_vouchee_privacy(self):
+        vouchee = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        self._vouch(vouchee)
+        name = vouchee.userprofile.full_name.encode("utf-8")
+        ok_(name in Client().get(self.url, follow=True).content)
+
+        profile = vouchee.userprofile
+        profile.privacy_full_name = MOZILLIANS
+        profile.save()
+        ok_(name not in Client().get(self.url, follow=True).content)
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    def test_fragment_invalidated_by_voucher_name(self):
+        voucher = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        voucher.userprofile.vouches_made.create(
+            vouchee=self.voucher.userprofile, date=timezone.now(), description="Foo"
+        )
+        Client().get(self.url, follow=True)
+
+        profile = voucher.userprofile
+        profile.full_name = "Renamed Voucher"
+        profile.save()
+        ok_(b"Renamed Voucher" in Client().get(self.url, follow=True).content)
+
+    @patch("mozillians.phonebook.views.VOUCHEES_PAGE_SIZE", 1)
+    def test_vouchees_pages(self):
+        vouchees = [
+            UserFactory.create(
+                userprofile={"full_name": name, "privacy_full_name": PUBLIC}
+            )
+            for name in ("Vouchee A", "Vouchee B")
+        ]
+        for vouchee in vouchees:
+            self._vouch(vouchee)
+
+        response = Client().get(self.url, follow=True)
+        ok_(b"Vouchee A" in response.content)
+        ok_(b"Vouchee B" not in response.content)
+        ok_(b"vouchees_page=2" in response.content)
+
+        response = Client().get(urlparams(self.url, vouchees_page=2), follow=True)
+        ok_(b"Vouchee A" not in response.content)
+        ok_(b"Vouchee B" in response.content)
+        ok_(b"vouchees_page=1" in response.content)
@@ -3,10 +3,12 @@ from django.contrib import messages
 from django.contrib.auth import logout as auth_logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.db.models import Prefetch, Q, prefetch_related_objects
 from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response
 from django.utils.translation import ugettext as _
-from django.views.decorators.cache import never_cache
+from django.views.decorators.cache import cache_control, never_cache
 from django.views.decorators.http import require_POST
 
 import mozillians.phonebook.forms as forms
@@ -14,12 +16,21 @@ from mozillians.common.decorators import allow_public, allow_unvouched
 from mozillians.common.middleware import GET_VOUCHED_MESSAGE, LOGIN_MESSAGE
 from mozillians.common.templatetags.helpers import redirect, urlparams
 from mozillians.common.urlresolvers import reverse
+from mozillians.phonebook.pagecache import (
+    get_cached_page,
+    get_profile_etag,
+    get_profile_version,
+    get_vouches_version,
+    is_page_cacheable,
+    set_cached_page,
+)
 from mozillians.users.managers import EMPLOYEES, MOZILLIANS, PRIVATE, PUBLIC
-from mozillians.users.models import IdpProfile, UserProfile
+from mozillians.users.models import IdpProfile, UserProfile, Vouch
 
 ORIGINAL_CONNECTION_USER_ID = (
     "https://sso.mozilla.com/claim/original_connection_user_id"
 )
+VOUCHEES_PAGE_SIZE = 100
 
 
 @never_cache
@@ -32,10 +43,40 @@ def home(request):
     return render(request, "phonebook/home.html")
 
 
+def _visible_vouches(privacy_level):
+    """Return the vouches whose vouchee has a field visible at privacy_level."""
+    vouches = Vouch.objects.all()
+    if privacy_level:
+        visible = Q()
+        for field in UserProfile.privacy_fields():
+            visible |= Q(**{"vouchee__privacy_%s__gte" % field: privacy_level})
+        vouches = vouches.filter(visible)
+    return vouches
+
+
+def _get_profile(username, privacy_level):
+    """Return the profile of username with its user and access flags, or None."""
+    return (
+        UserProfile.objects.privacy_level(privacy_level)
+        .with_access_flags()
+        .select_related("user")
+        .filter(user__username=username)
+        .first()
+    )
+
+
 @allow_public
-@never_cache
+@cache_control(private=True, no_cache=True, must_revalidate=True, max_age=0)
 def view_profile(request, username):
     """View a profile by username."""
+    use_page_cache = is_page_cacheable(request)
+    if use_page_cache:
+        response = get_cached_page(username)
+        if response is not None:
+            return get_conditional_response(
+                request, etag=response["ETag"], response=response
+            )
+
     data = {}
     privacy_mappings = {
         "anonymous": PUBLIC,
@@ -44,23 +85,17 @@ def view_profile(request, username):
         "private": PRIVATE,
         "myself": None,
     }
-    privacy_level = None
-
     if request.user.is_authenticated and request.user.username == username:
         # own profile
         view_as = request.GET.get("view_as", "myself")
         privacy_level = privacy_mappings.get(view_as, None)
-        profile = UserProfile.objects.privacy_level(privacy_level).get(
-            user__username=username
-        )
+        profile = _get_profile(username, privacy_level)
         data["privacy_mode"] = view_as
     else:
-        userprofile_query = UserProfile.objects.filter(user__username=username)
-        public_profile_exists = userprofile_query.public().exists()
-        profile_exists = userprofile_query.exists()
-        profile_complete = userprofile_query.exclude(full_name="").exists()
+        privacy_level = request.viewer.privacy_level
+        profile = _get_profile(username, privacy_level)
 
-        if not public_profile_exists:
+        if profile is None or not profile.is_public_profile:
             if not request.user.is_authenticated:
                 # you have to be authenticated to continue
                 messages.warning(request, LOGIN_MESSAGE)
@@ -68,29 +103,69 @@ def view_profile(request, username):
                     view_profile, login_url=reverse("phonebook:home")
                 )(request, username)
 
-            if not request.user.userprofile.is_vouched:
+            if not request.viewer.is_vouched:
                 # you have to be vouched to continue
                 messages.error(request, GET_VOUCHED_MESSAGE)
                 return redirect("phonebook:home")
 
-        if not profile_exists or not profile_complete:
+        if profile is None or not profile.is_complete_profile:
             raise Http404
 
-        profile = UserProfile.objects.get(user__username=username)
-        profile.set_instance_privacy_level(PUBLIC)
-        if request.user.is_authenticated:
-            profile.set_instance_privacy_level(request.user.userprofile.privacy_level)
+    version = get_profile_version(profile.pk)
+    vouches_version = get_vouches_version(profile.pk)
+    etag = get_profile_etag(request, profile, version, vouches_version, privacy_level)
+    # Pending messages are shown on the page, it has to be rendered again.
+    if not messages.get_messages(request):
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response["ETag"] = etag
+            return response
+
+    identities = IdpProfile.objects.all()
+    if privacy_level:
+        identities = identities.filter(privacy__gte=privacy_level)
+    prefetch_related_objects(
+        [profile],
+        Prefetch("idp_profiles", queryset=identities, to_attr="visible_identities"),
+    )
 
-    data["shown_user"] = profile.user
-    data["profile"] = profile
-    data["primary_identity"] = profile.identity_profiles.filter(
-        primary_contact_identity=True
+    try:
+        vouchees_page = max(int(request.GET.get("vouchees_page", 1)), 1)
+    except ValueError:
+        vouchees_page = 1
+    start = (vouchees_page - 1) * VOUCHEES_PAGE_SIZE
+    stop = start + VOUCHEES_PAGE_SIZE + 1
+    vouches = _visible_vouches(privacy_level)
+    # Only evaluated when the vouches fragment is not cached. One more
+    # vouchee than shown tells whether there is a next page.
+    data["vouches_received"] = vouches.filter(vouchee=profile).select_related(
+        "voucher__user"
     )
-    data["alternate_identities"] = profile.identity_profiles.filter(
-        primary_contact_identity=False
+    data["vouchees"] = (
+        vouches.filter(voucher=profile)
+        .select_related("vouchee__user")
+        .order_by("vouchee__full_name")[start:stop]
     )
+    data["vouchees_page"] = vouchees_page
+    data["vouchees_page_size"] = VOUCHEES_PAGE_SIZE
+    data["vouches_version"] = vouches_version
+    data["vouches_cache_timeout"] = settings.VOUCHES_CACHE_TIMEOUT
+    data["privacy_level"] = privacy_level
 
-    return render(request, "phonebook/profile.html", data)
+    data["shown_user"] = profile.user
+    data["profile"] = profile
+    data["primary_identity"] = [
+        idp for idp in profile.visible_identities if idp.primary_contact_identity
+    ]
+    data["alternate_identities"] = [
+        idp for idp in profile.visible_identities if not idp.primary_contact_identity
+    ]
+
+    response = render(request, "phonebook/profile.html", data)
+    response["ETag"] = etag
+    if use_page_cache:
+        set_cached_page(username, profile.pk, version, response)
+    return response
 
 
 @allow_unvouched
@@ -38,6 +38,8 @@ INSTALLED_APPS = (
     "django.contrib.admin",
     # Third-party apps, patches, fixes
     "django_jinja",
+    # Before compressor, overrides its compress command
+    "mozillians.common",
     "compressor",
     "django_nose",
     "csp",
@@ -46,7 +48,6 @@ INSTALLED_APPS = (
     "mozillians",
     "mozillians.users",
     "mozillians.phonebook",
-    "mozillians.common",
     "mozillians.announcements",
     "mozillians.humans",
     "sorl.thumbnail",
@@ -58,6 +59,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "mozillians.common.middleware.ViewerMiddleware",
     "mozillians.common.middleware.HSTSPreloadMiddleware",  # Must be before security middleware
     "mozillians.common.middleware.ReferrerPolicyMiddleware",  # Must be before security middleware
     "django.middleware.security.SecurityMiddleware",
@@ -101,6 +103,11 @@ X_FRAME_OPTIONS = config("X_FRAME_OPTIONS", default="DENY")
 SESSION_COOKIE_HTTPONLY = config("SESSION_COOKIE_HTTPONLY", default=True, cast=bool)
 SESSION_COOKIE_SECURE = config("SESSION_COOKIE_SECURE", default=True, cast=bool)
 SESSION_COOKIE_NAME = config("SESSION_COOKIE_NAME", default="mozillians_sessionid")
+# Sessions are read through the cache and only hit the DB on a cache miss.
+# Set to django.contrib.sessions.backends.signed_cookies to skip storage entirely.
+SESSION_ENGINE = config(
+    "SESSION_ENGINE", default="django.contrib.sessions.backends.cached_db"
+)
 
 # Security middleware
 SECURE_HSTS_INCLUDE_SUBDOMAINS = config(
@@ -207,12 +214,30 @@ CACHES = {
     }
 }
 
+# Seconds before the filter of existing usernames is rebuilt
+USERNAME_FILTER_TIMEOUT = config("USERNAME_FILTER_TIMEOUT", default=3600, cast=int)
+
+# Seconds anonymous views of public profiles are cached, 0 to disable
+PROFILE_PAGE_CACHE_TIMEOUT = config("PROFILE_PAGE_CACHE_TIMEOUT", default=0, cast=int)
+# Seconds the vouch sections of profiles are cached, also bounds how long
+# a renamed voucher or vouchee is shown with the old name
+VOUCHES_CACHE_TIMEOUT = config("VOUCHES_CACHE_TIMEOUT", default=3600, cast=int)
+
 # Google Analytics
 GA_ACCOUNT_CODE = config("GA_ACCOUNT_CODE", default="UA-35433268-19")
 
 # Sorl settings
 THUMBNAIL_DUMMY = config("THUMBNAIL_DUMMY", default=True, cast=bool)
 THUMBNAIL_PREFIX = config("THUMBNAIL_PREFIX", default="uploads/sorl-cache/")
+# Thumbnails generated when an image is saved, as (geometry, options) per
+# app_label.Model.field. Pages only show thumbnails generated beforehand.
+THUMBNAIL_GEOMETRIES = {
+    "announcements.Announcement.image": [("60x60", {"crop": "center"})],
+}
+# Processes generating thumbnails in the pregenerate_thumbnails command
+THUMBNAIL_WORKERS = config("THUMBNAIL_WORKERS", default=2, cast=int)
+# Static image shown in place of thumbnails not generated yet
+THUMBNAIL_PLACEHOLDER = "mozillians/img/thumbnail-placeholder.png"
 
 # Avatar
 USER_AVATAR_DIR = config("USER_AVATAR_DIR", default="uploads/userprofile")
@@ -241,9 +266,12 @@ ITEMS_PER_PAGE = config("ITEMS_PER_PAGE", default=24, cast=int)
 # Django compressor
 COMPRESS_OFFLINE = config("COMPRESS_OFFLINE", default=True, cast=bool)
 COMPRESS_ENABLED = config("COMPRESS_ENABLED", default=True, cast=bool)
-# Use custom CSS, JS compressors to enable SRI support
-COMPRESS_CSS_COMPRESSOR = "mozillians.common.compress.SRICssCompressor"
-COMPRESS_JS_COMPRESSOR = "mozillians.common.compress.SRIJsCompressor"
+# Use custom CSS, JS compressors to enable SRI support. django-appconf does
+# not prefix names starting with COMPRESS, the setting is COMPRESSORS.
+COMPRESSORS = {
+    "css": "mozillians.common.compress.SRICssCompressor",
+    "js": "mozillians.common.compress.SRIJsCompressor",
+}
 
 # humans.txt
 HUMANSTXT_GITHUB_REPO = config(
@@ -304,6 +332,12 @@ OIDC_EXEMPT_URLS = [
     "/verify/identity/callback/",
 ]
 OIDC_RP_SCOPES = "openid email profile"
+# Seconds a resolved login identity (user id for an Auth0 id and email) is cached
+OIDC_IDENTITY_CACHE_TIMEOUT = config("OIDC_IDENTITY_CACHE_TIMEOUT", default=60, cast=int)
+# Seconds the OP signing keys are cached, shared by all workers
+OIDC_JWKS_CACHE_TIMEOUT = config("OIDC_JWKS_CACHE_TIMEOUT", default=3600, cast=int)
+# Minimum seconds between JWKS refreshes triggered by an unknown key id
+OIDC_JWKS_MIN_REFRESH = config("OIDC_JWKS_MIN_REFRESH", default=60, cast=int)
 
 # AWS credentials
 AWS_ACCESS_KEY_ID = config("AWS_ACCESS_KEY_ID", default="")
@@ -322,6 +356,10 @@ AXES_COOLOFF_TIME = config("AXES_COOLOFF_TIME", default=1, cast=int)
 AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP = config(
     "AXES_LOCK_OUT_BY_COMBINATION_USER_AND_IP", default=True, cast=bool
 )
+# Count failed logins in the cache, flush them with ./manage.py flush_login_attempts
+AXES_HANDLER = config(
+    "AXES_HANDLER", default="mozillians.common.lockout.AxesCacheHandler"
+)
 
 # Setup logging and sentry
 if config("SENTRY_DSN", None):
@@ -353,10 +391,18 @@ COMMON_CONTEXT_PROCESSORS = [
     "mozillians.common.context_processors.canonical_path",
 ]
 
+# Compiled Jinja2 templates kept across restarts, filled at build time by
+# the precompile_templates command
+JINJA2_BYTECODE_CACHE = config("JINJA2_BYTECODE_CACHE", default=True, cast=bool)
+JINJA2_BYTECODE_DIR = config(
+    "JINJA2_BYTECODE_DIR", default=str(Path("jinja2-cache").resolve())
+)
+
 TEMPLATES = [
     {
         "BACKEND": "django_jinja.backend.Jinja2",
-        "DIRS": [Path("mozillians/jinja2").resolve()],
+        # A plain str, template file names end up in the compiled bytecode.
+        "DIRS": [str(Path("mozillians/jinja2").resolve())],
         "NAME": "jinja2",
         "APP_DIRS": True,
         "OPTIONS": {
@@ -368,6 +414,11 @@ TEMPLATES = [
             "extensions": DEFAULT_EXTENSIONS
             + ["compressor.contrib.jinja2ext.CompressorExtension"],
             "context_processors": COMMON_CONTEXT_PROCESSORS,
+            "bytecode_cache": {
+                "name": "jinja2",
+                "backend": "mozillians.common.bytecode.FileSystemBytecodeCache",
+                "enabled": JINJA2_BYTECODE_CACHE,
+            },
         },
     },
     {
@@ -528,3 +579,17 @@ if DEV:
 if DEBUG:
     for backend in TEMPLATES:
         backend["OPTIONS"]["debug"] = DEBUG
+
+# Per middleware and view timing, see mozillians.common.timing
+TIMING_ENABLED = config("TIMING_ENABLED", default=False, cast=bool)
+# Seconds between flushes of each process' timing histograms to the cache
+TIMING_FLUSH_INTERVAL = config("TIMING_FLUSH_INTERVAL", default=60, cast=int)
+
+if TIMING_ENABLED:
+    MIDDLEWARE = ["mozillians.common.timing.TimingMiddleware"] + [
+        path
+        for middleware in MIDDLEWARE
+        for path in (middleware, "mozillians.common.timing.StageMiddleware")
+    ]
+    CACHES["default"]["BACKEND"] = "mozillians.common.timing.MemcachedCache"
+    TEMPLATES[0]["BACKEND"] = "mozillians.common.timing.Jinja2"
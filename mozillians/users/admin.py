@@ -8,9 +8,11 @@ from django.contrib.auth.models import Group, User
 from django.db.models import Count, Q
 from django.urls import reverse
 
+from mozillians.common.admin import ExportMixin, export_action
 from mozillians.common.templatetags.helpers import get_datetime
 from mozillians.users.admin_forms import UserProfileAdminForm
 from mozillians.users.models import (
+    MOZILLIANS,
     PUBLIC,
     IdpProfile,
     UsernameBlacklist,
@@ -41,6 +43,18 @@ def update_vouch_flags_action():
     return update_vouch_flags
 
 
+def set_privacy_level_action(level, name):
+    """Set all privacy fields of the selected profiles to level action."""
+
+    def set_privacy_level(modeladmin, request, queryset):
+        count = queryset.set_privacy_level(level)
+        modeladmin.message_user(request, "%d profiles updated." % count)
+
+    set_privacy_level.__name__ = "set_privacy_level_%s" % level
+    set_privacy_level.short_description = "Set privacy level to %s" % name
+    return set_privacy_level
+
+
 class SuperUserFilter(SimpleListFilter):
     """Admin filter for superusers."""
 
@@ -84,9 +98,8 @@ class DateJoinedFilter(SimpleListFilter):
     parameter_name = "date_joined"
 
     def lookups(self, request, model_admin):
-        join_dates = User.objects.values_list("date_joined", flat=True)
-        join_years = [x.year for x in join_dates]
-        return [(str(x), x) for x in set(join_years)]
+        join_years = User.objects.dates("date_joined", "year")
+        return [(str(x.year), x.year) for x in join_years]
 
     def queryset(self, request, queryset):
         if self.value() is None:
@@ -145,7 +158,7 @@ class UsernameBlacklistAdmin(admin.ModelAdmin):
 admin.site.register(UsernameBlacklist, UsernameBlacklistAdmin)
 
 
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(ExportMixin, admin.ModelAdmin):
     search_fields = ["full_name", "user__email", "user__username", "is_staff"]
     readonly_fields = [
         "date_vouched",
@@ -177,7 +190,26 @@ class UserProfileAdmin(admin.ModelAdmin):
         "date_joined",
     ]
     list_display_links = ["full_name", "email", "username"]
-    actions = [update_vouch_flags_action()]
+    list_select_related = ["user"]
+    actions = [
+        update_vouch_flags_action(),
+        set_privacy_level_action(MOZILLIANS, "Mozillians"),
+        set_privacy_level_action(PUBLIC, "Public"),
+        export_action("csv"),
+        export_action("ndjson"),
+    ]
+    export_fields = [
+        "id",
+        "user__username",
+        "user__email",
+        "full_name",
+        "is_vouched",
+        "can_vouch",
+        "is_staff",
+        "vouches_made_count",
+        "user__date_joined",
+        "user__last_login",
+    ]
 
     fieldsets = (
         (
@@ -241,7 +273,7 @@ class UserProfileAdmin(admin.ModelAdmin):
     username.admin_order_field = "user__username"
 
     def is_vouched(self, obj):
-        return obj.userprofile.is_vouched
+        return obj.is_vouched
 
     is_vouched.boolean = True
     is_vouched.admin_order_field = "is_vouched"
@@ -282,7 +314,7 @@ class GroupAdmin(GroupAdmin):
 admin.site.register(Group, GroupAdmin)
 
 
-class VouchAdmin(admin.ModelAdmin):
+class VouchAdmin(ExportMixin, admin.ModelAdmin):
     save_on_top = True
     search_fields = [
         "voucher__user__username",
@@ -295,15 +327,40 @@ class VouchAdmin(admin.ModelAdmin):
     ]
     list_display = ["vouchee", "voucher", "date", "autovouch"]
     list_filter = ["autovouch"]
+    list_select_related = ["vouchee", "voucher"]
+    autocomplete_fields = ["vouchee", "voucher"]
+    actions = [export_action("csv"), export_action("ndjson")]
+    export_fields = [
+        "id",
+        "vouchee__user__username",
+        "vouchee__user__email",
+        "voucher__user__username",
+        "voucher__user__email",
+        "date",
+        "autovouch",
+        "description",
+    ]
 
 
 admin.site.register(Vouch, VouchAdmin)
 
 
-class IdpProfileAdmin(admin.ModelAdmin):
+class IdpProfileAdmin(ExportMixin, admin.ModelAdmin):
     resource_class = IdpProfile
     list_display = ["type", "profile", "auth0_user_id", "email", "primary"]
     list_filter = ["type"]
+    list_select_related = ["profile"]
+    autocomplete_fields = ["profile"]
+    actions = [export_action("csv"), export_action("ndjson")]
+    export_fields = [
+        "id",
+        "profile__user__username",
+        "type",
+        "email",
+        "auth0_user_id",
+        "primary",
+        "primary_contact_identity",
+    ]
     search_fields = [
         "profile__user__email",
         "profile__full_name",
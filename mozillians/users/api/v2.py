@@ -290,7 +290,7 @@ class UserProfileViewSet(NoCacheReadOnlyModelViewSet):
 
     def get_queryset(self):
         queryset = UserProfile.objects.complete()
-        privacy_level = self.request.privacy_level
+        privacy_level = self.request.viewer.privacy_level
         if privacy_level == PUBLIC:
             queryset = queryset.public()
 
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mozillians.users.managers import (
+    MOZILLIANS,
+    PRIVACY_UPDATE_CHUNK_SIZE,
+    PRIVATE,
+    PUBLIC,
+)
+from mozillians.users.models import UserProfile
+
+LEVELS = {"private": PRIVATE, "mozillians": MOZILLIANS, "public": PUBLIC}
+
+
+class Command(BaseCommand):
+    help = "Set the privacy level of privacy enabled fields for all profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument("level", choices=sorted(LEVELS))
+        parser.add_argument(
+            "--fields",
+            default="",
+            help="Comma separated privacy fields to update, e.g. email,full_name. "
+            "Defaults to all privacy fields.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=PRIVACY_UPDATE_CHUNK_SIZE,
+            help="Number of profiles updated per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        fields = [field.strip() for field in options["fields"].split(",") if field]
+        try:
+            count = UserProfile.objects.set_privacy_level(
+                LEVELS[options["level"]],
+                fields=fields or None,
+                chunk_size=options["chunk_size"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write("%d profiles updated." % count)
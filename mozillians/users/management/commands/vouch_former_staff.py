@@ -1,34 +1,50 @@
-from optparse import make_option
+import time
+from functools import partial
 
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import Lower
 from django.utils import timezone
 
-from mozillians.common.templatetags.helpers import get_object_or_none
+from mozillians.common.sanitize import render_markdown
+from mozillians.phonebook.pagecache import invalidate_profile_pages, invalidate_vouches
 from mozillians.users.models import UserProfile, Vouch
 
+EMPLOYEE_DESCR = "An automatic vouch for being a Mozilla employee."
+FORMER_EMPLOYEE_DESCR = "An automatic vouch for being a former Mozilla employee."
+
 
 class Command(BaseCommand):
+    help = "Auto-vouch former staff members listed in a file of emails."
 
-    option_list = list(BaseCommand.option_list) + [
-        make_option(
+    def add_arguments(self, parser):
+        parser.add_argument(
             "--file",
             dest="file",
             default=None,
             help="Path to file with line separated former staff emails.",
-        ),
-        make_option(
+        )
+        parser.add_argument(
             "--dry-run",
             dest="dry-run",
             action="store_true",
             default=False,
             help="Run without changing the DB.",
-        ),
-    ]
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk-size",
+            type=int,
+            default=1000,
+            help="Number of emails resolved per query.",
+        )
 
     def handle(self, *args, **options):
         path = options.get("file", None)
         dry_run = options.get("dry-run")
+        chunk_size = options.get("chunk-size")
 
         if not path:
             raise CommandError("Option --file must be specified")
@@ -38,31 +54,87 @@ class Command(BaseCommand):
         except IOError:
             raise CommandError("Invalid file path.")
 
-        now = timezone.now()
-        former_employee_descr = (
-            "An automatic vouch for being a former Mozilla employee."
+        start = time.time()
+        processed = 0
+        count = 0
+        with f:
+            chunk = set()
+            for line in f:
+                email = line.strip().lower()
+                if email:
+                    chunk.add(email)
+                    processed += 1
+                if len(chunk) >= chunk_size:
+                    count += self.vouch_chunk(chunk, dry_run)
+                    chunk = set()
+                    self.report(processed, count, start)
+            if chunk:
+                count += self.vouch_chunk(chunk, dry_run)
+                self.report(processed, count, start)
+
+        self.stdout.write("%d former staff members vouched." % count)
+
+    def report(self, processed, count, start):
+        elapsed = time.time() - start
+        rate = processed / elapsed if elapsed else processed
+        self.stdout.write(
+            "%d emails processed, %d vouched (%.0f emails/s)" % (processed, count, rate)
         )
-        employee_descr = "An automatic vouch for being a Mozilla employee."
 
-        count = 0
-        for email in f:
-            u = get_object_or_none(UserProfile, user__email=email.strip())
-            if u:
-                vouches = u.vouches_received.all()
-                already_vouched = vouches.filter(
-                    Q(description=employee_descr)
-                    | Q(description=former_employee_descr),
-                    autovouch=True,
-                )
-                if not already_vouched.exists():
-                    if not dry_run:
-                        Vouch.objects.create(
+    def vouch_chunk(self, emails, dry_run):
+        """Vouch the profiles matching emails that lack a staff auto-vouch."""
+        # Served by the lower(email) index of migration 0056 on PostgreSQL.
+        profile_ids = set(
+            UserProfile.objects.annotate(email_lower=Lower("user__email"))
+            .filter(email_lower__in=emails)
+            .values_list("pk", flat=True)
+        )
+        already_vouched = Vouch.objects.filter(
+            vouchee__in=profile_ids,
+            autovouch=True,
+            description__in=[EMPLOYEE_DESCR, FORMER_EMPLOYEE_DESCR],
+        ).values_list("vouchee_id", flat=True)
+        vouchee_ids = profile_ids - set(already_vouched)
+
+        if vouchee_ids and not dry_run:
+            now = timezone.now()
+            # bulk_create() skips Vouch.save(), render the description here.
+            description_html = render_markdown(FORMER_EMPLOYEE_DESCR)
+            with transaction.atomic():
+                Vouch.objects.bulk_create(
+                    [
+                        Vouch(
                             voucher=None,
-                            vouchee=u,
+                            vouchee_id=vouchee_id,
                             autovouch=True,
                             date=now,
-                            description=former_employee_descr,
+                            description=FORMER_EMPLOYEE_DESCR,
+                            description_html=description_html,
                         )
-                    count = count + 1
+                        for vouchee_id in vouchee_ids
+                    ]
+                )
+                self.update_vouch_flags(vouchee_ids)
+                # bulk_create() and update() send no signals, invalidate the
+                # cached pages of the vouchees once the chunk is committed.
+                transaction.on_commit(partial(invalidate_profile_pages, *vouchee_ids))
+                transaction.on_commit(partial(invalidate_vouches, *vouchee_ids))
+
+        return len(vouchee_ids)
 
-        print(("%d former staff members vouched." % count))
+    def update_vouch_flags(self, profile_ids):
+        """Update is_vouched and can_vouch for profiles that just got a vouch."""
+        vouch_counts = (
+            Vouch.objects.filter(vouchee__in=profile_ids)
+            # Without the default ordering, which would be grouped by too.
+            .order_by()
+            .values("vouchee")
+            .annotate(vouches_received=Count("id"))
+        )
+        can_vouch_ids = [
+            row["vouchee"]
+            for row in vouch_counts
+            if row["vouches_received"] >= settings.CAN_VOUCH_THRESHOLD
+        ]
+        UserProfile.objects.filter(pk__in=profile_ids).update(is_vouched=True)
+        UserProfile.objects.filter(pk__in=can_vouch_ids).update(can_vouch=True)
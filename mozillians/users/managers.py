@@ -1,8 +1,18 @@
+from functools import partial
+
 from django.apps import apps
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import BooleanField, Case, Q, Value, When
 from django.db.models.query import ModelIterable, QuerySet, ValuesIterable
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _lazy
 
+from mozillians.phonebook.pagecache import (
+    get_vouch_related_ids,
+    invalidate_profile_pages,
+    invalidate_vouches,
+)
+
 PRIVATE = 1
 EMPLOYEES = 2
 MOZILLIANS = 3
@@ -16,6 +26,9 @@ PRIVACY_CHOICES_WITH_PRIVATE = (
 
 PUBLIC_INDEXABLE_FIELDS = ["full_name", "ircname", "email"]
 
+# Profiles updated per transaction by UserProfileQuerySet.set_privacy_level.
+PRIVACY_UPDATE_CHUNK_SIZE = 1000
+
 
 class UserProfileValuesIterable(ValuesIterable):
     """Custom ValuesIterable to support privacy.
@@ -106,6 +119,26 @@ class UserProfileQuerySet(QuerySet):
         """Return complete profiles."""
         return self.exclude(full_name="")
 
+    def with_access_flags(self):
+        """Annotate is_public_profile and is_complete_profile.
+
+        They mirror public() and complete() and, unlike the is_public and
+        is_complete properties, do not depend on the privacy level of the
+        queryset.
+        """
+        return self.annotate(
+            is_public_profile=Case(
+                When(self.public_q, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            is_complete_profile=Case(
+                When(full_name="", then=Value(False)),
+                default=Value(True),
+                output_field=BooleanField(),
+            ),
+        )
+
     def public_indexable(self):
         """Return public indexable profiles."""
         return self.complete().filter(self.public_index_q)
@@ -113,6 +146,64 @@ class UserProfileQuerySet(QuerySet):
     def not_public_indexable(self):
         return self.complete().exclude(self.public_index_q)
 
+    def set_privacy_level(
+        self, level, fields=None, chunk_size=PRIVACY_UPDATE_CHUNK_SIZE
+    ):
+        """Set privacy of fields to level for all profiles in the queryset.
+
+        Bulk counterpart of UserProfile.set_privacy_level. Defaults to all
+        privacy enabled fields. Profiles are updated in chunks, each in its
+        own transaction, to bound lock time. Since identities and alternate
+        emails share the email privacy, they are updated along with it. The
+        cached pages and vouch sections showing a chunk are invalidated when
+        it commits.
+
+        Returns the number of profiles updated.
+        """
+        UserProfile = apps.get_model("users", "UserProfile")
+        IdpProfile = apps.get_model("users", "IdpProfile")
+        ExternalAccount = apps.get_model("users", "ExternalAccount")
+
+        privacy_fields = UserProfile.privacy_fields()
+        fields = list(fields or privacy_fields)
+        for field in fields:
+            if field not in privacy_fields:
+                raise ValueError("{0} is not a privacy field.".format(field))
+            choices = UserProfile._meta.get_field("privacy_%s" % field).choices
+            if level not in [choice for choice, label in choices]:
+                raise ValueError("Invalid privacy level for {0}.".format(field))
+        values = dict(("privacy_%s" % field, level) for field in fields)
+
+        count = 0
+        last_pk = 0
+        pks = self.order_by("pk").values_list("pk", flat=True)
+        while True:
+            chunk = list(pks.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                return count
+
+            now = timezone.now()
+            with transaction.atomic():
+                UserProfile.objects.filter(pk__in=chunk).update(
+                    last_updated=now, **values
+                )
+                if "email" in fields:
+                    IdpProfile.objects.filter(profile__in=chunk).update(
+                        privacy=level, updated=now
+                    )
+                    ExternalAccount.objects.filter(
+                        user__in=chunk, type=ExternalAccount.TYPE_EMAIL
+                    ).update(privacy=level)
+                # update() sends no signals. Invalidate the cached pages of
+                # the chunk, and the vouch sections listing it, once committed.
+                related_ids = get_vouch_related_ids(chunk)
+                transaction.on_commit(
+                    partial(invalidate_profile_pages, *(set(chunk) | related_ids))
+                )
+                transaction.on_commit(partial(invalidate_vouches, *related_ids))
+            count += len(chunk)
+            last_pk = chunk[-1]
+
     def _clone(self, *args, **kwargs):
         """Custom _clone with privacy level propagation."""
         c = super(UserProfileQuerySet, self)._clone(*args, **kwargs)
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+def populate_email_domain(apps, schema_editor):
+    IdpProfile = apps.get_model("users", "IdpProfile")
+    for idp in IdpProfile.objects.exclude(email="").only("pk", "email").iterator():
+        if "@" not in idp.email:
+            continue
+        domain = idp.email.rpartition("@")[2].lower()
+        IdpProfile.objects.filter(pk=idp.pk).update(email_domain=domain)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0051_remove_non_email_external_accounts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idpprofile',
+            name='email_domain',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+        migrations.RunPython(populate_email_domain, migrations.RunPython.noop),
+    ]
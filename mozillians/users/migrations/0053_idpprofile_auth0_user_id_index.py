@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:30
+
+from django.db import migrations
+
+INDEX_NAME = "users_idpprofile_auth0_user_id_hash"
+
+
+def create_auth0_user_id_index(apps, schema_editor):
+    # auth0_user_id is too long for a portable B-tree index and is only
+    # matched by equality, so use a hash index where available.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS {0} ON users_idpprofile "
+            "USING hash (auth0_user_id)".format(INDEX_NAME)
+        )
+
+
+def drop_auth0_user_id_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS {0}".format(INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0052_idpprofile_email_domain'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_auth0_user_id_index, drop_auth0_user_id_index),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:05
+
+from django.conf import settings
+from django.db import migrations
+
+INDEX_NAME = "users_auth_user_username_lower"
+
+
+def create_username_lower_index(apps, schema_editor):
+    # Case insensitive username lookups filter on lower(username).
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS {0} ON auth_user "
+            "(lower(username))".format(INDEX_NAME)
+        )
+
+
+def drop_username_lower_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS {0}".format(INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0053_idpprofile_auth0_user_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_username_lower_index, drop_username_lower_index),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 2.2.16 on 2026-10-19 12:20
+
+from django.db import migrations, models
+
+from mozillians.common.sanitize import render_markdown
+
+CHUNK_SIZE = 1000
+
+
+def render_descriptions(apps, schema_editor):
+    Vouch = apps.get_model("users", "Vouch")
+    vouches = Vouch.objects.exclude(description="").only("description")
+    chunk = []
+    for vouch in vouches.iterator(chunk_size=CHUNK_SIZE):
+        vouch.description_html = render_markdown(vouch.description)
+        chunk.append(vouch)
+        if len(chunk) == CHUNK_SIZE:
+            Vouch.objects.bulk_update(chunk, ["description_html"])
+            chunk = []
+    Vouch.objects.bulk_update(chunk, ["description_html"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0054_user_username_lower_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vouch',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(render_descriptions, migrations.RunPython.noop),
+    ]
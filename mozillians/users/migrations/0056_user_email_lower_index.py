@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-19 14:10
+
+from django.db import migrations
+
+INDEX_NAME = "users_auth_user_email_lower"
+
+
+def create_email_lower_index(apps, schema_editor):
+    # vouch_former_staff resolves emails on lower(email).
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS {0} ON auth_user "
+            "(lower(email))".format(INDEX_NAME)
+        )
+
+
+def drop_email_lower_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS {0}".format(INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0055_vouch_description_html'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_lower_index, drop_email_lower_index),
+    ]
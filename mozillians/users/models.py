@@ -12,6 +12,7 @@ from django.utils.http import urlquote
 from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_lazy as _lazy
 
+from mozillians.common.sanitize import render_markdown
 from mozillians.common.urlresolvers import reverse
 from mozillians.phonebook.validators import validate_email
 from mozillians.users.managers import (
@@ -437,6 +438,10 @@ class IdpProfile(models.Model):
     auth0_user_id = models.CharField(max_length=1024, default="", blank=True)
     primary = models.BooleanField(default=False)
     email = models.EmailField(blank=True, default="")
+    # Lowercased domain part of email, kept in sync on save for indexed lookups
+    email_domain = models.CharField(
+        max_length=255, default="", blank=True, db_index=True
+    )
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
     privacy = models.PositiveIntegerField(
@@ -445,6 +450,13 @@ class IdpProfile(models.Model):
     primary_contact_identity = models.BooleanField(default=False)
     username = models.CharField(max_length=1024, default="", blank=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded auth0_user_id to invalidate its cached identity."""
+        instance = super(IdpProfile, cls).from_db(db, field_names, values)
+        instance._loaded_auth0_user_id = instance.__dict__.get("auth0_user_id")
+        return instance
+
     def get_provider_type(self):
         """Helper method to autopopulate the model type given the user_id."""
         if "ad|" in self.auth0_user_id:
@@ -464,12 +476,18 @@ class IdpProfile(models.Model):
 
         return self.PROVIDER_UNKNOWN
 
+    def get_email_domain(self):
+        """Helper method to autopopulate the lowercased domain of the email."""
+        return self.email.rpartition("@")[2].lower() if "@" in self.email else ""
+
     def save(self, *args, **kwargs):
         """Custom save method.
 
-        Provides a default contact identity and a helper to assign the provider type.
+        Provides a default contact identity and helpers to assign the provider type
+        and the email domain.
         """
         self.type = self.get_provider_type()
+        self.email_domain = self.get_email_domain()
         # If there isn't a primary contact identity, create one
         if not (
             IdpProfile.objects.filter(
@@ -511,6 +529,8 @@ class Vouch(models.Model):
     description = models.TextField(
         max_length=500, verbose_name=_lazy("Reason for Vouching"), default=""
     )
+    # description rendered from markdown, kept up to date on save.
+    description_html = models.TextField(blank=True, default="", editable=False)
     autovouch = models.BooleanField(default=False)
     date = models.DateTimeField()
 
@@ -522,6 +542,10 @@ class Vouch(models.Model):
     def __unicode__(self):
         return "{0} vouched by {1}".format(self.vouchee, self.voucher)
 
+    def save(self, *args, **kwargs):
+        self.description_html = render_markdown(self.description)
+        super(Vouch, self).save(*args, **kwargs)
+
 
 class UsernameBlacklist(models.Model):
     value = models.CharField(max_length=30, unique=True)
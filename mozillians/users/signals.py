@@ -1,8 +1,17 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import signals
 from django.dispatch import receiver
 
-from mozillians.users.models import UserProfile
+from mozillians.common.authbackend import identity_cache_key
+from mozillians.phonebook.pagecache import (
+    get_vouch_related_ids,
+    invalidate_profile_pages,
+    invalidate_vouches,
+)
+from mozillians.users.models import IdpProfile, UserProfile, Vouch
+from mozillians.users.usernames import invalidate_username_filter
 
 
 # Signal to remove the User object when a profile is deleted
@@ -11,3 +20,105 @@ def delete_user_obj_sig(sender, instance, **kwargs):
     with transaction.atomic():
         if instance.user:
             instance.user.delete()
+
+
+def _invalidate_identities_on_commit(auth0_user_ids):
+    # Only once committed, so that concurrent logins do not cache the
+    # identity being replaced again.
+    keys = [identity_cache_key(pk) for pk in auth0_user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+# Signal to invalidate the cached login identity resolution
+@receiver(signals.post_save, sender=IdpProfile, dispatch_uid="idp_profile_cache_sig")
+@receiver(signals.post_delete, sender=IdpProfile, dispatch_uid="idp_profile_cache_sig")
+def invalidate_identity_cache_sig(sender, instance, **kwargs):
+    auth0_user_ids = set([instance.auth0_user_id])
+    # The identity may have been resolved under its previous user id.
+    loaded_auth0_user_id = getattr(instance, "_loaded_auth0_user_id", None)
+    if loaded_auth0_user_id is not None:
+        auth0_user_ids.add(loaded_auth0_user_id)
+    instance._loaded_auth0_user_id = instance.auth0_user_id
+    _invalidate_identities_on_commit(auth0_user_ids)
+
+
+@receiver(signals.post_init, sender=User, dispatch_uid="user_email_init_sig")
+def remember_user_email_sig(sender, instance, **kwargs):
+    instance._loaded_email = instance.__dict__.get("email")
+
+
+@receiver(signals.post_save, sender=User, dispatch_uid="user_identity_cache_sig")
+def invalidate_user_identity_cache_sig(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    # Identities are cached along with the email they were resolved with.
+    loaded_email = getattr(instance, "_loaded_email", None)
+    instance._loaded_email = instance.email
+    if created or loaded_email == instance.email:
+        return
+    if update_fields and "email" not in update_fields:
+        return
+    auth0_user_ids = IdpProfile.objects.filter(profile__user=instance).values_list(
+        "auth0_user_id", flat=True
+    )
+    _invalidate_identities_on_commit(auth0_user_ids)
+
+
+# Signal to add new usernames to the username filter
+@receiver(signals.post_save, sender=User, dispatch_uid="username_filter_sig")
+def invalidate_username_filter_sig(sender, instance, **kwargs):
+    # Only once committed, so that a rebuild in between includes the user.
+    username = instance.username
+    transaction.on_commit(lambda: invalidate_username_filter(username))
+
+
+def _invalidate_on_commit(invalidate, *profile_ids):
+    # Only once committed, so that the pages are not rendered again from
+    # the data being replaced.
+    profile_ids = [profile_id for profile_id in profile_ids if profile_id]
+    if profile_ids:
+        transaction.on_commit(lambda: invalidate(*profile_ids))
+
+
+def _invalidate_profiles_on_commit(*profile_ids):
+    # The vouch sections of other profiles show the names and links of
+    # these profiles, at the privacy levels they were rendered with.
+    related_ids = get_vouch_related_ids(profile_ids)
+    _invalidate_on_commit(invalidate_profile_pages, *(set(profile_ids) | related_ids))
+    _invalidate_on_commit(invalidate_vouches, *related_ids)
+
+
+# Signals to invalidate the cached profile pages
+@receiver(signals.post_save, sender=UserProfile, dispatch_uid="profile_page_sig")
+def invalidate_profile_pages_sig(sender, instance, **kwargs):
+    _invalidate_profiles_on_commit(instance.pk)
+
+
+@receiver(signals.pre_delete, sender=UserProfile, dispatch_uid="profile_page_delete_sig")
+def invalidate_deleted_profile_pages_sig(sender, instance, **kwargs):
+    # Before the vouches made by the profile lose their voucher.
+    _invalidate_profiles_on_commit(instance.pk)
+
+
+@receiver(signals.post_save, sender=User, dispatch_uid="user_profile_page_sig")
+def invalidate_user_profile_pages_sig(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= set(["last_login"]):
+        # Logins do not change the profile page.
+        return
+    profile_ids = UserProfile.objects.filter(user=instance).values_list("pk", flat=True)
+    _invalidate_profiles_on_commit(*profile_ids)
+
+
+@receiver(signals.post_save, sender=IdpProfile, dispatch_uid="idp_profile_page_sig")
+@receiver(signals.post_delete, sender=IdpProfile, dispatch_uid="idp_profile_page_sig")
+def invalidate_idp_profile_pages_sig(sender, instance, **kwargs):
+    _invalidate_on_commit(invalidate_profile_pages, instance.profile_id)
+
+
+@receiver(signals.post_save, sender=Vouch, dispatch_uid="vouch_profile_page_sig")
+@receiver(signals.post_delete, sender=Vouch, dispatch_uid="vouch_profile_page_sig")
+def invalidate_vouch_profile_pages_sig(sender, instance, **kwargs):
+    profile_ids = (instance.vouchee_id, instance.voucher_id)
+    _invalidate_on_commit(invalidate_profile_pages, *profile_ids)
+    _invalidate_on_commit(invalidate_vouches, *profile_ids)
@@ -1,9 +1,17 @@
+import json
+
+from django.db import connection
 from django.forms import ValidationError
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
-from nose.tools import eq_
+from nose.tools import eq_, ok_
 
 from mozillians.common.tests import TestCase
 from mozillians.users.admin import UserProfileAdminForm
+from mozillians.users.models import IdpProfile, Vouch
 from mozillians.users.tests import UserFactory
 
 
@@ -47,3 +55,114 @@ class UserProfileAdminFormTests(TestCase):
         form.cleaned_data = {"email": "bar@example.com"}
         with self.assertRaises(ValidationError):
             form.clean_email()
+
+
+class ChangelistQueryCountTests(TestCase):
+    """Changelist query counts must not grow with the number of rows."""
+
+    def setUp(self):
+        self.admin = UserFactory.create(is_superuser=True, is_staff=True)
+
+    def _count_queries(self, url):
+        client = Client()
+        client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        eq_(response.status_code, 200)
+        return len(queries)
+
+    def _create_rows(self, count):
+        for i in range(count):
+            voucher = UserFactory.create()
+            vouchee = UserFactory.create()
+            Vouch.objects.create(
+                voucher=voucher.userprofile,
+                vouchee=vouchee.userprofile,
+                date=timezone.now(),
+                description="vouch",
+            )
+            IdpProfile.objects.create(
+                profile=vouchee.userprofile,
+                auth0_user_id="github|{0}".format(vouchee.pk),
+                email=vouchee.email,
+            )
+
+    def _check_changelist(self, viewname):
+        url = reverse(viewname)
+        self._create_rows(2)
+        num_queries = self._count_queries(url)
+        self._create_rows(10)
+        eq_(self._count_queries(url), num_queries)
+
+    def test_userprofile_changelist(self):
+        self._check_changelist("admin:users_userprofile_changelist")
+
+    def test_vouch_changelist(self):
+        self._check_changelist("admin:users_vouch_changelist")
+
+    def test_idpprofile_changelist(self):
+        self._check_changelist("admin:users_idpprofile_changelist")
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.admin = UserFactory.create(is_superuser=True, is_staff=True)
+
+    def test_export_csv_applies_search(self):
+        UserFactory.create(username="foo")
+        UserFactory.create(username="bar")
+        url = reverse("admin:users_userprofile_export", args=["csv"])
+        client = Client()
+        client.force_login(self.admin)
+        response = client.get(url, {"q": "foo"})
+        eq_(response.status_code, 200)
+        eq_(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        eq_(len(lines), 2)
+        ok_(lines[0].startswith("id,user__username,"))
+        ok_(",foo," in lines[1])
+
+    def test_export_ndjson_applies_filters(self):
+        voucher = UserFactory.create()
+        vouchee = UserFactory.create()
+        Vouch.objects.create(
+            voucher=voucher.userprofile,
+            vouchee=vouchee.userprofile,
+            date=timezone.now(),
+            autovouch=True,
+        )
+        url = reverse("admin:users_vouch_export", args=["ndjson"])
+        client = Client()
+        client.force_login(self.admin)
+        response = client.get(url, {"autovouch__exact": "1"})
+        eq_(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        eq_(len(lines), 1)
+        row = json.loads(lines[0])
+        eq_(row["voucher__user__username"], voucher.username)
+        eq_(row["vouchee__user__username"], vouchee.username)
+
+    def test_export_action(self):
+        user = UserFactory.create()
+        idp = IdpProfile.objects.create(
+            profile=user.userprofile, auth0_user_id="ad|foo", email=user.email
+        )
+        url = reverse("admin:users_idpprofile_changelist")
+        data = {"action": "export_csv", "_selected_action": [idp.pk]}
+        client = Client()
+        client.force_login(self.admin)
+        response = client.post(url, data)
+        eq_(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        eq_(len(lines), 2)
+        ok_(user.email in lines[1])
+
+    def test_export_csv_escapes_formulas(self):
+        UserFactory.create(username="foo", userprofile={"full_name": "=HYPERLINK(1)"})
+        url = reverse("admin:users_userprofile_export", args=["csv"])
+        client = Client()
+        client.force_login(self.admin)
+        response = client.get(url, {"q": "foo"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        eq_(len(lines), 2)
+        ok_(",'=HYPERLINK(1)," in lines[1])
@@ -265,7 +265,7 @@ class UserProfileViewSetTests(TestCase):
     def test_get_queryset_public(self):
         viewset = UserProfileViewSet()
         viewset.request = Mock()
-        viewset.request.privacy_level = PUBLIC
+        viewset.request.viewer.privacy_level = PUBLIC
         with patch("mozillians.users.api.v2.UserProfile") as userprofile_mock:
             viewset.get_queryset()
 
@@ -278,7 +278,7 @@ class UserProfileViewSetTests(TestCase):
     def test_get_queryset_non_public(self):
         viewset = UserProfileViewSet()
         viewset.request = Mock()
-        viewset.request.privacy_level = MOZILLIANS
+        viewset.request.viewer.privacy_level = MOZILLIANS
         with patch("mozillians.users.api.v2.UserProfile") as userprofile_mock:
             viewset.get_queryset()
 
@@ -288,7 +288,7 @@ class UserProfileViewSetTests(TestCase):
     def test_retrieve_base(self):
         viewset = UserProfileViewSet()
         viewset.request = Mock()
-        viewset.request.privacy_level = MOZILLIANS
+        viewset.request.viewer.privacy_level = MOZILLIANS
         user = UserFactory.create()
         with patch(
             "mozillians.users.api.v2.UserProfileDetailedSerializer"
@@ -300,7 +300,7 @@ class UserProfileViewSetTests(TestCase):
     def test_retrieve_non_existent(self):
         viewset = UserProfileViewSet()
         viewset.request = Mock()
-        viewset.request.privacy_level = MOZILLIANS
+        viewset.request.viewer.privacy_level = MOZILLIANS
         self.assertRaises(Http404, viewset.retrieve, viewset.request, -1)
 
 
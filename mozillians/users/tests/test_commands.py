@@ -0,0 +1,71 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from nose.tools import eq_, ok_
+
+from mozillians.common.tests import TestCase
+from mozillians.users.management.commands.vouch_former_staff import EMPLOYEE_DESCR
+from mozillians.users.models import UserProfile, Vouch
+from mozillians.users.tests import UserFactory
+
+
+class VouchFormerStaffTests(TestCase):
+    def _call(self, emails, **options):
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(emails))
+        out = StringIO()
+        call_command("vouch_former_staff", file=path, stdout=out, **options)
+        return out.getvalue()
+
+    def _staff_vouches(self, user):
+        return user.userprofile.vouches_received.filter(autovouch=True, voucher=None)
+
+    def test_vouch_in_chunks(self):
+        users = UserFactory.create_batch(3, vouched=False)
+        out = self._call([user.email for user in users], chunk_size=2)
+        ok_("3 former staff members vouched." in out)
+        eq_(out.count("emails processed"), 2)
+        for user in users:
+            profile = UserProfile.objects.get(pk=user.userprofile.pk)
+            ok_(profile.is_vouched)
+            eq_(self._staff_vouches(user).count(), 1)
+
+    def test_already_vouched(self):
+        user = UserFactory.create()
+        Vouch.objects.create(
+            voucher=None,
+            vouchee=user.userprofile,
+            autovouch=True,
+            date=timezone.now(),
+            description=EMPLOYEE_DESCR,
+        )
+        out = self._call([user.email])
+        ok_("0 former staff members vouched." in out)
+        eq_(user.userprofile.vouches_received.count(), 2)
+
+    def test_dry_run(self):
+        user = UserFactory.create(vouched=False)
+        out = self._call([user.email], dry_run=True)
+        ok_("1 former staff members vouched." in out)
+        eq_(user.userprofile.vouches_received.count(), 0)
+
+    @override_settings(CAN_VOUCH_THRESHOLD=2)
+    def test_can_vouch_threshold(self):
+        # Vouched users already have one autovouch.
+        user = UserFactory.create()
+        other = UserFactory.create(vouched=False)
+        self._call([user.email, other.email])
+        ok_(UserProfile.objects.get(pk=user.userprofile.pk).can_vouch)
+        ok_(not UserProfile.objects.get(pk=other.userprofile.pk).can_vouch)
+
+    def test_email_case_insensitive(self):
+        user = UserFactory.create(email="Former.Staff@Example.com", vouched=False)
+        self._call([" former.staff@EXAMPLE.com "])
+        eq_(self._staff_vouches(user).count(), 1)
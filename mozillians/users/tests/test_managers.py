@@ -1,9 +1,13 @@
+from django.test import override_settings
+from django.utils import timezone
+
 from mock import patch
-from nose.tools import eq_
+from nose.tools import eq_, ok_
 
 from mozillians.common.tests import TestCase
-from mozillians.users.managers import PUBLIC
-from mozillians.users.models import UserProfile
+from mozillians.phonebook.pagecache import get_profile_version, get_vouches_version
+from mozillians.users.managers import MOZILLIANS, PRIVATE, PUBLIC
+from mozillians.users.models import ExternalAccount, IdpProfile, UserProfile
 from mozillians.users.tests import UserFactory
 
 
@@ -46,6 +50,18 @@ class UserProfileQuerySetTests(TestCase):
             set([complete_user_1.userprofile, complete_user_2.userprofile]),
         )
 
+    def test_with_access_flags(self):
+        public_user = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        incomplete_user = UserFactory.create(userprofile={"full_name": ""})
+        queryset = UserProfile.objects.privacy_level(PUBLIC).with_access_flags()
+        eq_(
+            dict(
+                (profile.user, (profile.is_public_profile, profile.is_complete_profile))
+                for profile in queryset
+            ),
+            {public_user: (True, True), incomplete_user: (False, False)},
+        )
+
     @patch(
         "mozillians.users.managers.PUBLIC_INDEXABLE_FIELDS",
         {"full_name": "", "email": ""},
@@ -91,3 +107,56 @@ class UserProfileQuerySetTests(TestCase):
         queryset = UserProfile.objects.all()
         queryset.privacy_level(99)
         eq_(queryset.all()[0]._privacy_level, 99)
+
+    def test_set_privacy_level(self):
+        UserFactory.create_batch(3)
+        # Per chunk: select, savepoint, three updates, related vouches, release;
+        # then a last select
+        with self.assertNumQueries(2 * 7 + 1):
+            count = UserProfile.objects.set_privacy_level(PUBLIC, chunk_size=2)
+        eq_(count, 3)
+        for profile in UserProfile.objects.all():
+            for field in UserProfile.privacy_fields():
+                eq_(getattr(profile, "privacy_%s" % field), PUBLIC)
+
+    def test_set_privacy_level_fields(self):
+        user = UserFactory.create(userprofile={"privacy_full_name": PUBLIC})
+        idp = IdpProfile.objects.create(
+            profile=user.userprofile, auth0_user_id="ad|foo", email=user.email
+        )
+        account = ExternalAccount.objects.create(
+            user=user.userprofile, identifier="foo@example.com", type="EMAIL"
+        )
+        UserProfile.objects.filter(pk=user.userprofile.pk).set_privacy_level(
+            PRIVATE, fields=["email"]
+        )
+        profile = UserProfile.objects.get(pk=user.userprofile.pk)
+        eq_(profile.privacy_email, PRIVATE)
+        eq_(profile.privacy_full_name, PUBLIC)
+        eq_(IdpProfile.objects.get(pk=idp.pk).privacy, PRIVATE)
+        eq_(ExternalAccount.objects.get(pk=account.pk).privacy, PRIVATE)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    @patch("mozillians.users.managers.transaction.on_commit", lambda func: func())
+    def test_set_privacy_level_invalidates_pages(self):
+        voucher = UserFactory.create().userprofile
+        vouchee = UserFactory.create().userprofile
+        vouchee.vouches_received.create(
+            voucher=voucher, date=timezone.now(), description="Foo"
+        )
+        page_version = get_profile_version(vouchee.pk)
+        vouches_version = get_vouches_version(voucher.pk)
+        UserProfile.objects.filter(pk=vouchee.pk).set_privacy_level(
+            MOZILLIANS, fields=["full_name"]
+        )
+        ok_(get_profile_version(vouchee.pk) != page_version)
+        ok_(get_vouches_version(voucher.pk) != vouches_version)
+
+    def test_set_privacy_level_invalid(self):
+        UserFactory.create()
+        with self.assertRaises(ValueError):
+            UserProfile.objects.set_privacy_level(PRIVATE, fields=["full_name"])
+        with self.assertRaises(ValueError):
+            UserProfile.objects.set_privacy_level(MOZILLIANS, fields=["foo"])
@@ -570,6 +570,22 @@ class VouchTests(TestCase):
         profile = UserProfile.objects.get(pk=profile.id)
         ok_(not profile.vouches_received.all())
 
+    def test_vouch_description_html(self):
+        voucher = UserFactory.create()
+        user = UserFactory.create(vouched=False)
+        vouch = Vouch.objects.create(
+            voucher=voucher.userprofile,
+            vouchee=user.userprofile,
+            description="**Great** contributor",
+            date=now(),
+        )
+        eq_(vouch.description_html, "<p><strong>Great</strong> contributor</p>")
+
+        vouch.description = "Great *friend*"
+        vouch.save()
+        vouch = Vouch.objects.get(pk=vouch.pk)
+        eq_(vouch.description_html, "<p>Great <em>friend</em></p>")
+
     @override_settings(CAN_VOUCH_THRESHOLD=1)
     def test_vouch_once_per_voucher(self):
         voucher = UserFactory.create()
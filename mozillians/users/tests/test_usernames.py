@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import override_settings
+
+from mock import patch
+from nose.tools import ok_
+
+from mozillians.common.bloom import BloomFilter
+from mozillians.common.tests import TestCase
+from mozillians.users.tests import UserFactory
+from mozillians.users.usernames import get_username_filter, username_exists
+
+
+class BloomFilterTests(TestCase):
+    def test_no_false_negatives(self):
+        values = ["user{0}".format(i) for i in range(1000)]
+        bloom = BloomFilter(len(values))
+        for value in values:
+            bloom.add(value)
+        ok_(all(value in bloom for value in values))
+
+    def test_error_rate(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add("user{0}".format(i))
+        false_positives = sum("other{0}".format(i) in bloom for i in range(10000))
+        ok_(false_positives < 300)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class UsernameExistsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory.create(username="Foo.Bar")
+
+    def test_case_insensitive(self):
+        ok_(username_exists("foo.bar"))
+        ok_(username_exists("FOO.BAR"))
+
+    def test_unknown_usernames_skip_db(self):
+        get_username_filter()
+        with self.assertNumQueries(0):
+            ok_(not username_exists("wp-admin"))
+            ok_(not username_exists(".env"))
+            ok_(not username_exists("wp-admin/setup-config.php"))
+
+    @patch("mozillians.users.signals.transaction.on_commit", lambda func: func())
+    def test_new_users(self):
+        get_username_filter()
+        UserFactory.create(username="newcomer")
+        ok_(username_exists("newcomer"))
+
+    def test_new_users_after_commit(self):
+        get_username_filter()
+        # The test transaction never commits.
+        UserFactory.create(username="newcomer")
+        ok_(not username_exists("newcomer"))
@@ -0,0 +1,61 @@
+from django.test import RequestFactory
+
+from nose.tools import eq_
+
+from mozillians.common.tests import TestCase
+from mozillians.users.models import IdpProfile
+from mozillians.users.tests import UserFactory
+from mozillians.users.views import StaffProfilesAutocomplete
+
+
+class StaffProfilesAutocompleteTests(TestCase):
+    def setUp(self):
+        self.user = UserFactory.create()
+        self.request = RequestFactory().get("/")
+        self.request.user = self.user
+
+    def _create_staff(self, count):
+        for i in range(count):
+            user = UserFactory.create()
+            IdpProfile.objects.create(
+                profile=user.userprofile,
+                auth0_user_id="ad|staff{0}".format(i),
+                email="staff{0}@Mozilla.com".format(i),
+                primary=True,
+            )
+
+    def _get_results(self):
+        view = StaffProfilesAutocomplete()
+        view.request = self.request
+        view.q = ""
+        return view.get_results({"object_list": view.get_queryset()})
+
+    def test_email_domain(self):
+        idp = IdpProfile.objects.create(
+            profile=self.user.userprofile,
+            auth0_user_id="ad|foo",
+            email="foo@Mozilla.COM",
+        )
+        eq_(idp.email_domain, "mozilla.com")
+
+    def test_staff_results(self):
+        IdpProfile.objects.create(
+            profile=self.user.userprofile,
+            auth0_user_id="github|foo",
+            email="foo@example.com",
+            primary=True,
+        )
+        self._create_staff(2)
+        results = self._get_results()
+        eq_(len(results), 2)
+        emails = set(result["text"].rsplit(" ", 1)[1] for result in results)
+        eq_(emails, set(["(staff0@Mozilla.com)", "(staff1@Mozilla.com)"]))
+
+    def test_staff_results_query_count(self):
+        self._create_staff(2)
+        with self.assertNumQueries(1):
+            eq_(len(self._get_results()), 2)
+
+        self._create_staff(10)
+        with self.assertNumQueries(1):
+            eq_(len(self._get_results()), 12)
@@ -0,0 +1,86 @@
+import re
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.functions import Lower
+
+from mozillians.common.bloom import BloomFilter
+
+USERNAME_RE = re.compile(r"^[\w.@+-]+\Z")
+USERNAME_FILTER_KEY = "username_filter"
+USERNAME_FILTER_VERSION_KEY = "username_filter_version"
+USERNAME_FILTER_LOCK_KEY = "username_filter_lock"
+USERNAME_FILTER_ERROR_RATE = 0.01
+
+# The last filter this process loaded from the cache, as (version, filter).
+_local = {"version": None, "filter": None}
+
+
+def _build_username_filter():
+    usernames = User.objects.values_list(Lower("username"), flat=True)
+    # Leave room for users joining before the next rebuild.
+    usernames_filter = BloomFilter(
+        int(User.objects.count() * 1.1) + 1000, USERNAME_FILTER_ERROR_RATE
+    )
+    for username in usernames.iterator():
+        usernames_filter.add(username)
+    return usernames_filter
+
+
+def get_username_filter():
+    """Return a BloomFilter of all the lowercased usernames.
+
+    The filter is shared by all processes through the cache, and kept in
+    memory until its version changes. Returns None while another process
+    is building it.
+    """
+    version = cache.get(USERNAME_FILTER_VERSION_KEY)
+    if version is not None and version == _local["version"]:
+        return _local["filter"]
+
+    shared = cache.get(USERNAME_FILTER_KEY)
+    if version is None or not shared or shared["version"] != version:
+        if not cache.add(USERNAME_FILTER_LOCK_KEY, True, 60):
+            return None
+        try:
+            shared = {"version": uuid.uuid4().hex, "filter": _build_username_filter()}
+            timeout = settings.USERNAME_FILTER_TIMEOUT
+            cache.set(USERNAME_FILTER_KEY, shared, timeout)
+            cache.set(USERNAME_FILTER_VERSION_KEY, shared["version"], timeout)
+        finally:
+            cache.delete(USERNAME_FILTER_LOCK_KEY)
+
+    _local.update(shared)
+    return shared["filter"]
+
+
+def invalidate_username_filter(username):
+    """Rebuild the filter if it does not know about username yet."""
+    username = username.lower()
+    if _local["filter"] is not None and username in _local["filter"]:
+        return
+    shared = cache.get(USERNAME_FILTER_KEY)
+    if shared and username in shared["filter"]:
+        return
+    cache.delete(USERNAME_FILTER_VERSION_KEY)
+
+
+def username_exists(username):
+    """Case insensitive check for a user with username.
+
+    Names that are not valid usernames, or that the username filter
+    rules out, are answered without querying the DB.
+    """
+    if not USERNAME_RE.match(username):
+        return False
+    username = username.lower()
+    usernames_filter = get_username_filter()
+    if usernames_filter is not None and username not in usernames_filter:
+        return False
+    return (
+        User.objects.annotate(username_lower=Lower("username"))
+        .filter(username_lower=username)
+        .exists()
+    )
@@ -1,12 +1,8 @@
-from functools import reduce
-from operator import or_
-
 from dal import autocomplete
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q, Subquery
 
-from mozillians.common.templatetags.helpers import get_object_or_none
 from mozillians.users.models import IdpProfile, UserProfile
 
 
@@ -86,13 +82,11 @@ class StaffProfilesAutocomplete(autocomplete.Select2QuerySetView):
             if not pk:
                 continue
 
-            profile = UserProfile.objects.get(pk=pk)
-            idp = get_object_or_none(IdpProfile, profile=profile, primary=True)
             text = self.get_result_label(result)
 
             # Append the email used for login in the autocomplete text
-            if idp:
-                text += " ({0})".format(idp.email)
+            if result.primary_idp_email:
+                text += " ({0})".format(result.primary_idp_email)
 
             item = {"id": pk, "text": text}
             results.append(item)
@@ -102,18 +96,20 @@ class StaffProfilesAutocomplete(autocomplete.Select2QuerySetView):
         if not self.request.user.userprofile.is_vouched:
             return UserProfile.objects.none()
 
-        queries = []
-
         # Query staff profiles
-        for domain in settings.AUTO_VOUCH_DOMAINS:
-            pks = IdpProfile.objects.filter(email__endswith="@" + domain).values_list(
-                "profile__pk", flat=True
-            )
-            queries.append(Q(pk__in=pks))
-
-        query = reduce(or_, queries)
+        staff_idps = IdpProfile.objects.filter(
+            profile=OuterRef("pk"), email_domain__in=settings.AUTO_VOUCH_DOMAINS
+        )
+        primary_idps = IdpProfile.objects.filter(profile=OuterRef("pk"), primary=True)
 
-        qs = UserProfile.objects.filter(query).distinct()
+        qs = (
+            UserProfile.objects.select_related("user")
+            .annotate(
+                is_staff_profile=Exists(staff_idps),
+                primary_idp_email=Subquery(primary_idps.values("email")[:1]),
+            )
+            .filter(is_staff_profile=True)
+        )
         if self.q:
             qs = qs.filter(
                 Q(full_name__icontains=self.q)